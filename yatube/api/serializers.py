@@ -0,0 +1,117 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from sorl.thumbnail import get_thumbnail
+
+from posts.models import Comment, Post
+
+from .utils import ApiError
+
+POST_FIELDS = {
+    'id': ('id',),
+    'text': ('text',),
+    'text_html': ('text_html',),
+    'pub_date': ('pub_date',),
+    'author': ('author__username', 'author__first_name', 'author__last_name'),
+    'group': ('group__slug', 'group__title'),
+    'image': ('image',),
+    'comments': (),
+}
+DEFAULT_POST_FIELDS = ('id', 'text', 'pub_date', 'author', 'group', 'image')
+POST_CACHE_KEY = 'api:post:{}'
+
+
+def get_fields(request, default=DEFAULT_POST_FIELDS):
+    fields = request.GET.get('fields')
+    if not fields:
+        return default
+    fields = tuple(field for field in fields.split(',') if field)
+    unknown = set(fields) - set(POST_FIELDS)
+    if unknown:
+        raise ApiError(400, f'Неизвестные поля: {", ".join(sorted(unknown))}')
+    return fields
+
+
+def optimize(posts, fields):
+    """Загружает только колонки и связи, нужные для запрошенных полей."""
+    columns = {'id', 'pub_date'}
+    for field in fields:
+        columns.update(POST_FIELDS[field])
+    if 'author' in fields:
+        posts = posts.select_related('author')
+    if 'group' in fields:
+        posts = posts.select_related('group')
+    if 'comments' in fields:
+        posts = posts.prefetch_related(Prefetch(
+            'comments',
+            queryset=Comment.objects.select_related('author').order_by(
+                'created'),
+        ))
+    return posts.only(*columns)
+
+
+def serialize_user(user):
+    return {
+        'username': user.username,
+        'full_name': user.get_full_name(),
+    }
+
+
+def serialize_comment(comment):
+    return {
+        'id': comment.id,
+        'author': serialize_user(comment.author),
+        'text': comment.text,
+        'created': comment.created.isoformat(),
+    }
+
+
+def serialize_post(post, fields):
+    data = {}
+    for field in fields:
+        if field == 'pub_date':
+            data[field] = post.pub_date.isoformat()
+        elif field == 'author':
+            data[field] = serialize_user(post.author)
+        elif field == 'group':
+            data[field] = post.group and {
+                'slug': post.group.slug,
+                'title': post.group.title,
+            }
+        elif field == 'image':
+            data[field] = post.image.url if post.image else None
+        elif field == 'comments':
+            data[field] = [
+                serialize_comment(comment) for comment in post.comments.all()
+            ]
+        else:
+            data[field] = getattr(post, field)
+    return data
+
+
+def get_posts_by_ids(post_ids):
+    """Посты в порядке post_ids: сначала из кэша, остальные одним запросом."""
+    keys = {post_id: POST_CACHE_KEY.format(post_id) for post_id in post_ids}
+    cached = cache.get_many(keys.values())
+    found = {
+        post_id: cached[key] for post_id, key in keys.items() if key in cached
+    }
+    missing = [post_id for post_id in post_ids if post_id not in found]
+    if missing:
+        posts = Post.objects.select_related('author', 'group').in_bulk(
+            missing)
+        fresh = {}
+        for post_id, post in posts.items():
+            data = serialize_post(post, DEFAULT_POST_FIELDS)
+            data['thumbnail'] = None
+            if post.image:
+                data['thumbnail'] = get_thumbnail(
+                    post.image, settings.API_THUMBNAIL_SIZE,
+                    crop='center', upscale=False,
+                ).url
+            fresh[keys[post_id]] = found[post_id] = data
+        cache.set_many(fresh, settings.API_BATCH_CACHE_TIMEOUT)
+    return (
+        [found[post_id] for post_id in post_ids if post_id in found],
+        [post_id for post_id in post_ids if post_id not in found],
+    )
@@ -0,0 +1,172 @@
+from http import HTTPStatus
+from io import BytesIO
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image as PILImage
+
+from posts.models import Comment, Follow, Group, Post, User
+
+AMOUNT_POSTS = 7
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='Api', first_name='Иван', last_name='Петров',
+        )
+        cls.reader = User.objects.create_user(username='Reader')
+        cls.group = Group.objects.create(
+            title='Группа', slug='api', description='Описание',
+        )
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=cls.user, group=cls.group)
+            for number in range(AMOUNT_POSTS)
+        )
+        cls.post = Post.objects.first()
+
+    def setUp(self):
+        self.reader_client = Client()
+        self.reader_client.force_login(self.reader)
+
+    def test_cursor_pagination(self):
+        """Курсор проходит всю ленту без повторов и пропусков."""
+        seen = []
+        url = reverse('api:index')
+        params = {'limit': 3}
+        while True:
+            data = self.client.get(url, params).json()
+            seen.extend(post['id'] for post in data['results'])
+            if data['next'] is None:
+                break
+            params['cursor'] = data['next']
+        expected = list(Post.objects.order_by(
+            '-pub_date', '-id').values_list('id', flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_malformed_cursor(self):
+        """Поврежденный курсор возвращает 400."""
+        for cursor in ('!!!', 'WzEsIDJd', 'WyJ4IiwgMV0='):
+            with self.subTest(cursor=cursor):
+                response = self.client.get(
+                    reverse('api:index'), {'cursor': cursor})
+                self.assertEqual(
+                    response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_sparse_fields_skip_joins(self):
+        """При fields=id,text запрос не делает join'ов."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                reverse('api:index'), {'fields': 'id,text'})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('JOIN', queries[0]['sql'])
+        self.assertEqual(
+            set(response.json()['results'][0]), {'id', 'text'})
+
+    def test_unknown_field(self):
+        """Неизвестное поле возвращает 400."""
+        response = self.client.get(
+            reverse('api:index'), {'fields': 'id,password'})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_conditional_request(self):
+        """Повторный запрос с ETag получает 304."""
+        url = reverse('api:group_list', args=(self.group.slug,))
+        response = self.client.get(url)
+        self.assertEqual(response.json()['group']['slug'], self.group.slug)
+        response = self.client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, HTTPStatus.NOT_MODIFIED)
+
+    def test_post_detail_with_comments(self):
+        """Детальная запись поста включает комментарии."""
+        Comment.objects.create(post=self.post, author=self.reader, text='!')
+        data = self.client.get(
+            reverse('api:post_detail', args=(self.post.id,))).json()
+        self.assertEqual(data['author']['full_name'], 'Иван Петров')
+        self.assertEqual(data['comments'][0]['text'], '!')
+        response = self.client.get(reverse('api:post_detail', args=(0,)))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
+
+    def test_add_comment(self):
+        """Комментарий создается только авторизованным пользователем."""
+        url = reverse('api:add_comment', args=(self.post.id,))
+        response = self.client.post(url, {'text': 'Гость'})
+        self.assertEqual(response.status_code, HTTPStatus.UNAUTHORIZED)
+        response = self.reader_client.post(url, {'text': 'Привет'})
+        self.assertEqual(response.status_code, HTTPStatus.CREATED)
+        self.assertTrue(
+            Comment.objects.filter(post=self.post, text='Привет').exists())
+
+    def test_follow_and_unfollow(self):
+        """Подписка и отписка через API."""
+        url = reverse('api:profile_follow', args=(self.user.username,))
+        self.assertTrue(self.reader_client.post(url).json()['following'])
+        self.assertTrue(Follow.objects.filter(
+            user=self.reader, author=self.user).exists())
+        self.assertFalse(self.reader_client.delete(url).json()['following'])
+        self.assertFalse(Follow.objects.exists())
+
+    def test_batch_preserves_order_and_reports_missing(self):
+        """Пакетный запрос сохраняет порядок id и сообщает о ненайденных."""
+        cache.clear()
+        ids = list(Post.objects.values_list('id', flat=True)[:3])[::-1]
+        url = reverse('api:post_batch')
+        with self.assertNumQueries(1):
+            data = self.client.get(
+                url, {'ids': ','.join(map(str, ids + [0]))}).json()
+        self.assertEqual([post['id'] for post in data['results']], ids)
+        self.assertEqual(data['missing'], [0])
+        self.assertEqual(data['results'][0]['author']['username'], 'Api')
+        with self.assertNumQueries(0):
+            self.client.get(url, {'ids': ','.join(map(str, ids))})
+
+    def test_batch_cache_invalidated_on_save(self):
+        """Изменение поста сбрасывает его кэш."""
+        cache.clear()
+        url = reverse('api:post_batch')
+        self.client.get(url, {'ids': self.post.id})
+        Post.objects.filter(pk=self.post.pk).first().save()
+        with self.assertNumQueries(1):
+            self.client.get(url, {'ids': self.post.id})
+
+    def test_batch_limits(self):
+        """Слишком много или некорректные id возвращают 400."""
+        url = reverse('api:post_batch')
+        with self.settings(API_BATCH_MAX_IDS=2):
+            response = self.client.get(url, {'ids': '1,2,3'})
+        self.assertEqual(response.status_code, HTTPStatus.BAD_REQUEST)
+        for ids in ('1,x', '1,²'):
+            with self.subTest(ids=ids):
+                response = self.client.get(url, {'ids': ids})
+                self.assertEqual(
+                    response.status_code, HTTPStatus.BAD_REQUEST)
+
+    def test_batch_with_image_thumbnail_cached(self):
+        """Миниатюра строится при первом запросе и кэшируется с постом."""
+        cache.clear()
+        image = BytesIO()
+        PILImage.new('RGB', (20, 10), 'red').save(image, 'GIF')
+        post = Post.objects.create(
+            text='С картинкой',
+            author=self.user,
+            image=SimpleUploadedFile(
+                name='batch.gif',
+                content=image.getvalue(),
+                content_type='image/gif',
+            ),
+        )
+        url = reverse('api:post_batch')
+        result = self.client.get(url, {'ids': post.id}).json()['results'][0]
+        self.assertEqual(result['image'], post.image.url)
+        self.assertTrue(result['thumbnail'])
+        self.assertNotEqual(result['thumbnail'], post.image.url)
+        with self.assertNumQueries(0):
+            cached = self.client.get(url, {'ids': post.id}).json()
+        self.assertEqual(cached['results'][0], result)
@@ -0,0 +1,34 @@
+from django.urls import path
+
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('posts/', views.index, name='index'),
+    path('posts/batch/', views.post_batch, name='post_batch'),
+    path('posts/<int:post_id>/', views.post_detail, name='post_detail'),
+    path(
+        'posts/<int:post_id>/comments/',
+        views.add_comment,
+        name='add_comment'
+    ),
+    path('groups/<slug:slug>/posts/', views.group_posts, name='group_list'),
+    path('profiles/<str:username>/posts/', views.profile, name='profile'),
+    path(
+        'profiles/<str:username>/follow/',
+        views.profile_follow,
+        name='profile_follow'
+    ),
+    path(
+        'profiles/<str:username>/mutual/',
+        views.mutual_follows,
+        name='mutual_follows'
+    ),
+    path('follows/', views.bulk_follow, name='bulk_follow'),
+    path(
+        'follows/suggestions/',
+        views.follow_suggestions,
+        name='follow_suggestions'
+    ),
+]
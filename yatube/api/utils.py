@@ -0,0 +1,78 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+from posts.utils import decode_cursor, encode_cursor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ApiError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(
+        data, ensure_ascii=False, separators=(',', ':'),
+    ).encode()
+
+
+def json_response(request, data, status=200):
+    content = dumps(data)
+    etag = '"%s"' % hashlib.md5(content).hexdigest()
+    if request.method == 'GET' and status == 200:
+        conditional = get_conditional_response(request, etag=etag)
+        if conditional is not None:
+            conditional['ETag'] = etag
+            return conditional
+    response = HttpResponse(
+        content, status=status, content_type='application/json',
+    )
+    response['ETag'] = etag
+    return response
+
+
+def error_response(request, error):
+    return json_response(
+        request, {'detail': error.message}, status=error.status,
+    )
+
+
+def get_limit(request):
+    limit = request.GET.get('limit', '')
+    if not limit.isdecimal() or int(limit) == 0:
+        return settings.POST_PER_PAGE
+    return min(int(limit), settings.API_MAX_PAGE_SIZE)
+
+
+def paginate(request, posts):
+    """Курсорная пагинация по (pub_date, id) от новых к старым."""
+    posts = posts.order_by('-pub_date', '-id')
+    cursor = request.GET.get('cursor')
+    if cursor:
+        position = decode_cursor(cursor, True)
+        if position is None or position[0] is None:
+            raise ApiError(400, 'Некорректный курсор.')
+        pub_date, post_id = position
+        posts = posts.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=post_id)
+        )
+    limit = get_limit(request)
+    page = list(posts[:limit + 1])
+    next_cursor = None
+    if len(page) > limit:
+        last = page[limit - 1]
+        next_cursor = encode_cursor(last.pub_date, last.id)
+    return page[:limit], next_cursor
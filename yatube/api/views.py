@@ -0,0 +1,166 @@
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET, require_http_methods
+
+from posts.forms import CommentForm
+from posts import follows
+from posts.graph import get_graph
+from posts.models import Group, Post, User
+
+from .serializers import (
+    DEFAULT_POST_FIELDS, get_fields, get_posts_by_ids, optimize,
+    serialize_comment, serialize_post, serialize_user,
+)
+from .utils import ApiError, error_response, json_response, paginate
+
+
+def api_view(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        try:
+            return view(request, *args, **kwargs)
+        except ApiError as error:
+            return error_response(request, error)
+        except Http404:
+            return error_response(request, ApiError(404, 'Не найдено.'))
+    return wrapper
+
+
+def authenticated(request):
+    if not request.user.is_authenticated:
+        raise ApiError(401, 'Требуется авторизация.')
+
+
+def post_list(request, posts, **extra):
+    fields = get_fields(request)
+    page, next_cursor = paginate(request, optimize(posts, fields))
+    return json_response(request, {
+        **extra,
+        'results': [serialize_post(post, fields) for post in page],
+        'next': next_cursor,
+    })
+
+
+@require_GET
+@api_view
+def index(request):
+    return post_list(request, Post.objects.all())
+
+
+@require_GET
+@api_view
+def group_posts(request, slug):
+    group = get_object_or_404(Group, slug=slug)
+    return post_list(request, group.posts.all(), group={
+        'slug': group.slug,
+        'title': group.title,
+        'description': group.description,
+    })
+
+
+@require_GET
+@api_view
+def profile(request, username):
+    author = get_object_or_404(User, username=username)
+    return post_list(
+        request, author.posts.all(), author=serialize_user(author),
+    )
+
+
+@require_GET
+@api_view
+def post_detail(request, post_id):
+    fields = get_fields(request, default=(*DEFAULT_POST_FIELDS, 'comments'))
+    post = get_object_or_404(optimize(Post.objects.all(), fields), pk=post_id)
+    return json_response(request, serialize_post(post, fields))
+
+
+@require_GET
+@api_view
+def post_batch(request):
+    ids = [post_id for post_id in request.GET.get('ids', '').split(',')
+           if post_id]
+    if not ids or not all(post_id.isdecimal() for post_id in ids):
+        raise ApiError(400, 'Передайте id постов через запятую.')
+    if len(ids) > settings.API_BATCH_MAX_IDS:
+        raise ApiError(
+            400, f'Не больше {settings.API_BATCH_MAX_IDS} id за запрос.')
+    post_ids = list(dict.fromkeys(int(post_id) for post_id in ids))
+    results, missing = get_posts_by_ids(post_ids)
+    return json_response(request, {'results': results, 'missing': missing})
+
+
+@require_http_methods(['POST'])
+@api_view
+def add_comment(request, post_id):
+    authenticated(request)
+    post = get_object_or_404(Post.objects.only('id'), pk=post_id)
+    form = CommentForm(request.POST)
+    if not form.is_valid():
+        return json_response(request, {'errors': form.errors}, status=400)
+    comment = form.save(commit=False)
+    comment.author = request.user
+    comment.post = post
+    comment.save()
+    return json_response(request, serialize_comment(comment), status=201)
+
+
+@require_http_methods(['POST', 'DELETE'])
+@api_view
+def profile_follow(request, username):
+    authenticated(request)
+    if request.method == 'DELETE':
+        changed = follows.unfollow(request.user, username)
+        following = False
+    else:
+        changed = follows.follow(request.user, username)
+        following = username != request.user.username
+    if not changed and not follows.author_exists(username):
+        raise Http404
+    return json_response(request, {'following': following})
+
+
+@require_http_methods(['POST'])
+@api_view
+def bulk_follow(request):
+    authenticated(request)
+    try:
+        usernames = json.loads(request.body)['usernames']
+    except (ValueError, KeyError, TypeError):
+        raise ApiError(400, 'Передайте {"usernames": [...]} в теле запроса.')
+    if (not isinstance(usernames, list)
+            or not all(isinstance(name, str) for name in usernames)):
+        raise ApiError(400, 'usernames должен быть списком строк.')
+    if len(usernames) > settings.API_BULK_FOLLOW_MAX:
+        raise ApiError(
+            400, f'Не больше {settings.API_BULK_FOLLOW_MAX} имен за запрос.')
+    missing = follows.bulk_follow(request.user, usernames)
+    return json_response(request, {'missing': missing})
+
+
+@require_GET
+@api_view
+def mutual_follows(request, username):
+    author = get_object_or_404(User, username=username)
+    users = User.objects.in_bulk(get_graph().mutual(author.pk))
+    return json_response(request, {
+        'results': [serialize_user(user) for user in users.values()],
+    })
+
+
+@require_GET
+@api_view
+def follow_suggestions(request):
+    authenticated(request)
+    suggestions = get_graph().suggestions(request.user.pk)
+    users = User.objects.in_bulk([user_id for user_id, _ in suggestions])
+    return json_response(request, {
+        'results': [
+            {**serialize_user(users[user_id]), 'followed_by': count}
+            for user_id, count in suggestions if user_id in users
+        ],
+    })
@@ -0,0 +1,113 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_init, post_save, pre_delete,
+)
+from django.dispatch import receiver
+
+User = get_user_model()
+
+VERSION_CACHE_KEY = 'auth:user:{}:version'
+USER_CACHE_KEY = 'auth:user:{}:{}'
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend, который берет пользователя сессии из кэша. Запись
+    сбрасывается сменой версии при изменении пароля, is_active, is_staff,
+    is_superuser, групп и прав пользователя или прав его групп;
+    queryset.update() сигналов не шлет, поэтому после него вызывайте
+    invalidate_user(), иначе запись доживет до AUTH_USER_CACHE_TIMEOUT.
+    """
+
+    def get_user(self, user_id):
+        version = cache.get(VERSION_CACHE_KEY.format(user_id), 0)
+        key = USER_CACHE_KEY.format(user_id, version)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.AUTH_USER_CACHE_TIMEOUT)
+        return user
+
+
+def invalidate_user(user_id):
+    key = VERSION_CACHE_KEY.format(user_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, None)
+
+
+def invalidate_users(user_ids):
+    for user_id in user_ids:
+        invalidate_user(user_id)
+
+
+AUTH_FIELDS = ('password', 'is_active', 'is_staff', 'is_superuser')
+
+
+def auth_fields(instance):
+    return tuple(instance.__dict__.get(field) for field in AUTH_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_auth_fields(sender, instance, **kwargs):
+    instance._saved_auth_fields = auth_fields(instance)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, **kwargs):
+    fields = auth_fields(instance)
+    if created or fields != instance._saved_auth_fields:
+        invalidate_user(instance.pk)
+    instance._saved_auth_fields = fields
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def user_access_changed(sender, instance, action, reverse, pk_set,
+                        **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        invalidate_user(instance.pk)
+    elif pk_set is not None:
+        invalidate_users(pk_set)
+    else:
+        invalidate_users(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(m2m_changed, sender=Group.permissions.through)
+def group_permissions_changed(sender, instance, action, reverse, pk_set,
+                              **kwargs):
+    if action not in ('post_add', 'post_remove', 'pre_clear'):
+        return
+    if not reverse:
+        users = User.objects.filter(groups=instance)
+    elif pk_set is not None:
+        users = User.objects.filter(groups__in=pk_set)
+    else:
+        users = User.objects.filter(groups__permissions=instance)
+    invalidate_users(users.values_list('pk', flat=True).distinct())
+
+
+@receiver(pre_delete, sender=Group)
+def group_deleted(sender, instance, **kwargs):
+    invalidate_users(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(pre_delete, sender=Permission)
+def permission_deleted(sender, instance, **kwargs):
+    users = User.objects.filter(user_permissions=instance).values_list(
+        'pk', flat=True).union(User.objects.filter(
+            groups__permissions=instance).values_list('pk', flat=True))
+    invalidate_users(users)
@@ -0,0 +1,24 @@
+import gzip
+import re
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.txt', '.html', '.map')
+re_accepts_br = re.compile(r'\bbr\b')
+
+
+def compress_gzip(content):
+    return gzip.compress(content, compresslevel=9)
+
+
+def compress_brotli(content):
+    return brotli.compress(content, quality=11)
+
+
+def accepts_brotli(request):
+    return brotli is not None and bool(
+        re_accepts_br.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    )
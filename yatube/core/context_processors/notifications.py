@@ -0,0 +1,9 @@
+from functools import partial
+
+from posts.notifications import unread_count
+
+
+def notifications(request):
+    return {
+        'unread_notifications': partial(unread_count, request.user)
+    }
@@ -0,0 +1,78 @@
+from django.db import models
+from django.utils.module_loading import import_string
+from django.utils.text import Truncator
+
+
+class ExcerptField(models.CharField):
+    """Начало текстового поля source, заполняется при сохранении,
+    в том числе через bulk_create."""
+
+    def __init__(self, source, length, *args, **kwargs):
+        self.source = source
+        self.length = length
+        kwargs['max_length'] = length
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('blank', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        del kwargs['max_length']
+        kwargs['source'] = self.source
+        kwargs['length'] = self.length
+        return name, path, args, kwargs
+
+    def make_excerpt(self, text):
+        return Truncator(text).chars(self.length)
+
+    def pre_save(self, model_instance, add):
+        value = self.make_excerpt(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class RenderedField(models.TextField):
+    """HTML, который функция renderer строит из поля source
+    при сохранении, чтобы не разбирать текст на каждом показе."""
+
+    def __init__(self, source, renderer, *args, **kwargs):
+        self.source = source
+        self.renderer = renderer
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('blank', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        kwargs['renderer'] = self.renderer
+        return name, path, args, kwargs
+
+    def render(self, model_instance):
+        return import_string(self.renderer)(
+            getattr(model_instance, self.source))
+
+    def pre_save(self, model_instance, add):
+        value = self.render(model_instance)
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class VersionField(models.PositiveSmallIntegerField):
+    """Версия кода по пути version, записанная при сохранении."""
+
+    def __init__(self, version, *args, **kwargs):
+        self.version = version
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('default', 0)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['version'] = self.version
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = import_string(self.version)
+        setattr(model_instance, self.attname, value)
+        return value
@@ -0,0 +1,106 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_init, post_save
+from django.http import Http404
+
+# Отметка проходит через pickle общего кэша и возвращается новой
+# строкой, поэтому сравнивается через ==, а не is.
+MISSING = 'missing'
+
+
+class LookupCache:
+    """
+    Объекты model по уникальному полю field: сначала LRU процесса с TTL,
+    затем общий кэш, затем база. Отсутствующие значения тоже кэшируются,
+    на LOOKUP_NEGATIVE_TTL секунд.
+    """
+
+    def __init__(self, model, field, only=None):
+        self.model = model
+        self.field = field
+        self.only = only
+        self.local = OrderedDict()
+        self.lock = threading.Lock()
+        self.prefix = f'lookup:{model._meta.label_lower}:{field}'
+        post_init.connect(self.remember, sender=model, weak=False)
+        post_save.connect(self.invalidate, sender=model, weak=False)
+        post_delete.connect(self.invalidate, sender=model, weak=False)
+
+    def key(self, value):
+        return f'{self.prefix}:{hashlib.md5(value.encode()).hexdigest()}'
+
+    def get_local(self, value):
+        with self.lock:
+            entry = self.local.get(value)
+            if entry is None:
+                return None
+            if entry[1] < time.monotonic():
+                del self.local[value]
+                return None
+            self.local.move_to_end(value)
+            return entry[0]
+
+    def set_local(self, value, obj):
+        ttl = settings.LOOKUP_LOCAL_TTL
+        if obj == MISSING:
+            ttl = min(ttl, settings.LOOKUP_NEGATIVE_TTL)
+        with self.lock:
+            self.local[value] = (obj, time.monotonic() + ttl)
+            self.local.move_to_end(value)
+            while len(self.local) > settings.LOOKUP_CACHE_SIZE:
+                self.local.popitem(last=False)
+
+    def load(self, value):
+        objects = self.model.objects.filter(**{self.field: value})
+        if self.only:
+            objects = objects.only(*self.only)
+        return objects.first()
+
+    def get(self, value):
+        obj = self.get_local(value)
+        if obj is None:
+            key = self.key(value)
+            obj = cache.get(key)
+            if obj is None:
+                obj = self.load(value)
+                if obj is None:
+                    obj = MISSING
+                    cache.set(key, obj, settings.LOOKUP_NEGATIVE_TTL)
+                else:
+                    cache.set(key, obj, settings.LOOKUP_SHARED_TTL)
+            self.set_local(value, obj)
+        return None if obj == MISSING else obj
+
+    def get_or_404(self, value):
+        obj = self.get(value)
+        if obj is None:
+            raise Http404(f'{self.model._meta.object_name} не найден.')
+        return obj
+
+    def forget(self, value):
+        if value is None:
+            return
+        with self.lock:
+            self.local.pop(value, None)
+        cache.delete(self.key(value))
+
+    def clear(self):
+        with self.lock:
+            self.local.clear()
+
+    def remember(self, sender, instance, **kwargs):
+        instance.__dict__[f'_lookup_{self.field}'] = (
+            instance.__dict__.get(self.field))
+
+    def invalidate(self, sender, instance, **kwargs):
+        """Сбрасывает и старое, и новое значение поля: после
+        переименования старый адрес должен начать отдавать 404."""
+        self.forget(instance.__dict__.get(f'_lookup_{self.field}'))
+        self.forget(instance.__dict__.get(self.field))
+        instance.__dict__[f'_lookup_{self.field}'] = (
+            instance.__dict__.get(self.field))
@@ -0,0 +1,117 @@
+import hashlib
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import get_connection
+from django.core.mail.backends.base import BaseEmailBackend
+
+logger = logging.getLogger(__name__)
+
+
+def recipient_allowed(address):
+    """Не больше EMAIL_RATE_LIMIT писем на адрес за EMAIL_RATE_PERIOD."""
+    digest = hashlib.md5(address.lower().encode()).hexdigest()
+    key = f'email_rate:{digest}'
+    cache.add(key, 0, settings.EMAIL_RATE_PERIOD)
+    try:
+        sent = cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, settings.EMAIL_RATE_PERIOD)
+        sent = 1
+    return sent <= settings.EMAIL_RATE_LIMIT
+
+
+def throttle(message):
+    message.to = [addr for addr in message.to if recipient_allowed(addr)]
+    message.cc = [addr for addr in message.cc if recipient_allowed(addr)]
+    message.bcc = [addr for addr in message.bcc if recipient_allowed(addr)]
+    return bool(message.recipients())
+
+
+class EmailQueue:
+    """Очередь писем, которую разбирает фоновый поток пачками."""
+
+    def __init__(self, autostart=True):
+        self.autostart = autostart
+        self.messages = queue.Queue()
+        self.lock = threading.Lock()
+        self.worker = None
+        self.connection = None
+
+    def put(self, messages):
+        for message in messages:
+            self.messages.put(message)
+        if self.autostart:
+            self.start()
+
+    def start(self):
+        with self.lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(
+                    target=self.run, name='email-queue', daemon=True,
+                )
+                self.worker.start()
+
+    def next_batch(self, timeout=None):
+        try:
+            batch = [self.messages.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        while len(batch) < settings.EMAIL_QUEUE_BATCH_SIZE:
+            try:
+                batch.append(self.messages.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def deliver(self, batch):
+        if self.connection is None:
+            self.connection = get_connection(
+                settings.EMAIL_QUEUE_BACKEND, fail_silently=True,
+            )
+            self.connection.open()
+        try:
+            return self.connection.send_messages(batch) or 0
+        except Exception:
+            logger.exception('Не удалось отправить %s писем', len(batch))
+            self.close()
+            return 0
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def flush(self):
+        sent = 0
+        batch = self.next_batch(timeout=0)
+        while batch:
+            sent += self.deliver(batch)
+            batch = self.next_batch(timeout=0)
+        self.close()
+        return sent
+
+    def run(self):
+        while True:
+            batch = self.next_batch(timeout=settings.EMAIL_QUEUE_IDLE_TIMEOUT)
+            if batch:
+                self.deliver(batch)
+            else:
+                self.close()
+
+
+email_queue = EmailQueue()
+
+
+class QueuedEmailBackend(BaseEmailBackend):
+    """Ставит письма в очередь вместо отправки в потоке запроса."""
+
+    def send_messages(self, email_messages):
+        messages = [
+            message for message in email_messages if throttle(message)
+        ]
+        email_queue.put(messages)
+        return len(messages)
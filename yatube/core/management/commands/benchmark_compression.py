@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.test import Client
+
+ENCODINGS = (
+    ('identity', ''),
+    ('gzip', 'gzip'),
+    ('br', 'br, gzip'),
+)
+
+
+class Command(BaseCommand):
+    help = 'Показывает размер ответа страницы с сжатием и без.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=['/'])
+
+    def handle(self, paths, **options):
+        client = Client()
+        for path in paths:
+            sizes = {}
+            for name, accept in ENCODINGS:
+                response = client.get(path, HTTP_ACCEPT_ENCODING=accept)
+                encoding = response.get('Content-Encoding', 'identity')
+                sizes[encoding] = len(response.content)
+            original = sizes['identity']
+            report = ', '.join(
+                f'{encoding}: {size} байт ({size / original:.0%})'
+                for encoding, size in sizes.items()
+            )
+            self.stdout.write(f'{path}: {report}')
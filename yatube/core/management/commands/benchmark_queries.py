@@ -0,0 +1,56 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+User = get_user_model()
+
+DJANGO_DEFAULTS = {
+    'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+    'AUTHENTICATION_BACKENDS': ['django.contrib.auth.backends.ModelBackend'],
+}
+AUTH_QUERY = re.compile(r'FROM "(django_session|auth_user)"')
+
+
+class Command(BaseCommand):
+    help = (
+        'Считает SQL-запросы страницы для анонима и авторизованного '
+        'пользователя: стандартные сессии Django против текущих настроек.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=['/'])
+        parser.add_argument('--user', required=True)
+
+    def count(self, path, user):
+        client = Client()
+        if user is not None:
+            client.force_login(user)
+        client.get(path)
+        with CaptureQueriesContext(connection) as queries:
+            client.get(path)
+        auth_queries = [
+            query for query in queries if AUTH_QUERY.search(query['sql'])
+        ]
+        return len(queries), len(auth_queries)
+
+    def handle(self, paths, user, **options):
+        try:
+            user = User.objects.get(username=user)
+        except User.DoesNotExist:
+            raise CommandError(f'Пользователь {user} не найден')
+        for path in paths:
+            for title, viewer in (('аноним', None), ('автор', user)):
+                cache.clear()
+                with override_settings(**DJANGO_DEFAULTS):
+                    before = self.count(path, viewer)
+                cache.clear()
+                after = self.count(path, viewer)
+                self.stdout.write(
+                    f'{path} ({title}): запросов {before[0]} -> {after[0]}, '
+                    f'из них сессия и пользователь {before[1]} -> {after[1]}'
+                )
@@ -0,0 +1,33 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+
+from core.profiling import template_profiler
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Показывает, на какие шаблоны и теги уходит время рендера.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Адрес страницы, например /')
+        parser.add_argument('--user', help='Запрос от имени пользователя')
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--limit', type=int, default=20)
+
+    def handle(self, path, user, repeat, limit, **options):
+        client = Client()
+        if user:
+            try:
+                client.force_login(User.objects.get(username=user))
+            except User.DoesNotExist:
+                raise CommandError(f'Пользователь {user} не найден')
+        client.get(path)
+        with template_profiler() as profile:
+            for _ in range(repeat):
+                response = client.get(path)
+        if response.status_code != 200:
+            raise CommandError(f'{path} вернул {response.status_code}')
+        self.stdout.write(f'{path}: {repeat} запросов')
+        self.stdout.write(profile.report(limit))
@@ -0,0 +1,37 @@
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+
+from .compression import accepts_brotli, brotli
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Сжимает ответы не короче COMPRESSION_MIN_SIZE: brotli, если он
+    установлен и поддерживается клиентом, иначе gzip. Типы из
+    COMPRESSION_SKIP_TYPES отдаются как есть.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '')
+        if content_type.startswith(settings.COMPRESSION_SKIP_TYPES):
+            return response
+        if (not response.streaming
+                and len(response.content) < settings.COMPRESSION_MIN_SIZE):
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+        if response.streaming or not accepts_brotli(request):
+            return super().process_response(request, response)
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(
+            response.content, quality=settings.COMPRESSION_BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = 'br'
+        return response
@@ -0,0 +1,65 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+
+from django.template.base import Node
+
+
+class TemplateProfile:
+    def __init__(self):
+        self.templates = defaultdict(lambda: [0, 0.0])
+        self.tags = defaultdict(lambda: [0, 0.0])
+        self.stack = []
+
+    def enter(self):
+        self.stack.append(0.0)
+
+    def exit(self, node, elapsed):
+        children = self.stack.pop()
+        if self.stack:
+            self.stack[-1] += elapsed
+        origin = getattr(node, 'origin', None)
+        template_name = getattr(origin, 'template_name', None) or '<string>'
+        template_stats = self.templates[template_name]
+        template_stats[0] += 1
+        template_stats[1] += elapsed - children
+        tag_stats = self.tags[type(node).__name__]
+        tag_stats[0] += 1
+        tag_stats[1] += elapsed
+
+    def report(self, limit=20):
+        """Шаблоны по собственному времени и теги по полному времени."""
+        lines = ['Шаблон (собственное время)', '-' * 60]
+        lines += self.format(self.templates, limit)
+        lines += ['', 'Тег (полное время)', '-' * 60]
+        lines += self.format(self.tags, limit)
+        return '\n'.join(lines)
+
+    @staticmethod
+    def format(stats, limit):
+        rows = sorted(stats.items(), key=lambda item: -item[1][1])[:limit]
+        return [
+            f'{name:<44} {calls:>6} {seconds * 1000:>8.2f} ms'
+            for name, (calls, seconds) in rows
+        ]
+
+
+@contextmanager
+def template_profiler():
+    """Замеряет время рендера каждого узла шаблонов внутри блока."""
+    profile = TemplateProfile()
+    original = Node.render_annotated
+
+    def render_annotated(node, context):
+        profile.enter()
+        start = perf_counter()
+        try:
+            return original(node, context)
+        finally:
+            profile.exit(node, perf_counter() - start)
+
+    Node.render_annotated = render_annotated
+    try:
+        yield profile
+    finally:
+        Node.render_annotated = original
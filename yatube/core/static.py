@@ -0,0 +1,41 @@
+import mimetypes
+import os
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.views import static
+
+from .compression import accepts_brotli
+
+re_accepts_gzip = re.compile(r'\bgzip\b')
+re_hashed_name = re.compile(r'\.[0-9a-f]{12}\.\w+$')
+
+
+def serve(request, path):
+    """
+    Отдает собранную статику: готовый .br/.gz вариант, если он есть, и
+    заголовки долгого кэширования для файлов с хешем в имени.
+    """
+    variants = []
+    if accepts_brotli(request):
+        variants.append(('.br', 'br'))
+    if re_accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+        variants.append(('.gz', 'gzip'))
+    encoding = None
+    served_path = path
+    for suffix, variant_encoding in variants:
+        if os.path.isfile(os.path.join(settings.STATIC_ROOT, path + suffix)):
+            served_path, encoding = path + suffix, variant_encoding
+            break
+    response = static.serve(
+        request, served_path, document_root=settings.STATIC_ROOT)
+    patch_vary_headers(response, ('Accept-Encoding',))
+    if encoding:
+        content_type = mimetypes.guess_type(path)[0]
+        response['Content-Type'] = content_type or 'application/octet-stream'
+        response['Content-Encoding'] = encoding
+    if re_hashed_name.search(path):
+        response['Cache-Control'] = (
+            f'public, max-age={settings.STATIC_MAX_AGE}, immutable')
+    return response
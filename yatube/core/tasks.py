@@ -0,0 +1,57 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connection, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.BACKGROUND_WORKERS,
+            thread_name_prefix='background',
+        )
+    return _executor
+
+
+def drain():
+    """Дожидается всех фоновых задач; следующий submit создаст пул заново."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def run(func, args):
+    try:
+        func(*args)
+    except Exception:
+        logger.exception('Фоновая задача %s завершилась ошибкой', func)
+
+
+def run_in_thread(func, args):
+    try:
+        run(func, args)
+    finally:
+        connection.close()
+
+
+def submit(func, *args):
+    """
+    Выполняет func сейчас: в фоновом потоке, если BACKGROUND_WORKERS
+    больше нуля, иначе в текущем потоке.
+    """
+    if settings.BACKGROUND_WORKERS:
+        get_executor().submit(run_in_thread, func, args)
+    else:
+        run(func, args)
+
+
+def defer(func, *args):
+    """Выполняет func через submit() после коммита транзакции."""
+    transaction.on_commit(lambda: submit(func, *args))
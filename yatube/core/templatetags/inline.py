@@ -0,0 +1,47 @@
+from django import template
+from django.template.base import Node
+from django.template.engine import Engine
+
+register = template.Library()
+
+
+class InlineIncludeNode(Node):
+    def __init__(self, nodelist, extra_context):
+        self.nodelist = nodelist
+        self.extra_context = extra_context
+
+    def render(self, context):
+        values = {
+            name: var.resolve(context)
+            for name, var in self.extra_context.items()
+        }
+        with context.push(**values):
+            return self.nodelist.render(context)
+
+
+@register.tag
+def include_inline(parser, token):
+    """
+    Как {% include %}, но шаблон компилируется вместе с родительским:
+    {% include_inline 'posts/includes/post_card.html' with show_group=True %}
+    """
+    bits = token.split_contents()
+    if len(bits) < 2 or bits[1][0] not in '\'"' or bits[1][-1] != bits[1][0]:
+        raise template.TemplateSyntaxError(
+            f'{bits[0]} принимает имя шаблона строкой'
+        )
+    extra_context = {}
+    if len(bits) > 2:
+        if bits[2] != 'with':
+            raise template.TemplateSyntaxError(
+                f'{bits[0]}: ожидается "with" после имени шаблона'
+            )
+        extra_context = template.base.token_kwargs(bits[3:], parser)
+        if len(extra_context) != len(bits) - 3:
+            raise template.TemplateSyntaxError(
+                f'{bits[0]}: после "with" нужны аргументы вида name=value'
+            )
+    loader = getattr(parser.origin, 'loader', None)
+    engine = loader.engine if loader else Engine.get_default()
+    included = engine.get_template(bits[1][1:-1])
+    return InlineIncludeNode(included.nodelist, extra_context)
@@ -0,0 +1,111 @@
+import re
+
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.auth import invalidate_user
+from posts.models import User
+
+AUTH_QUERY = re.compile(r'FROM "(django_session|auth_user)"')
+
+
+class CachedAuthTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Cached', password='1')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def auth_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [
+            query['sql'] for query in queries
+            if AUTH_QUERY.search(query['sql'])
+        ]
+
+    def test_session_and_user_from_cache(self):
+        """Повторный запрос не обращается к сессиям и пользователям в БД."""
+        url = reverse('posts:index')
+        self.client.get(url)
+        response, queries = self.auth_queries(url)
+        self.assertEqual(queries, [])
+        self.assertEqual(response.wsgi_request.user, self.user)
+
+    def test_user_change_invalidates_cache(self):
+        """Смена пароля сбрасывает кэш и старую сессию."""
+        url = reverse('posts:index')
+        self.client.get(url)
+        self.user.set_password('2')
+        self.user.save()
+        response = self.client.get(url)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+    def test_deactivation_invalidates_cache(self):
+        """Отключенный пользователь сразу теряет сессию."""
+        url = reverse('posts:index')
+        self.client.get(url)
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+        response = self.client.get(url)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+    def test_queryset_update_with_invalidate_user(self):
+        """После update() кэш сбрасывает invalidate_user()."""
+        url = reverse('posts:index')
+        self.client.get(url)
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        invalidate_user(self.user.pk)
+        response = self.client.get(url)
+        self.assertFalse(response.wsgi_request.user.is_authenticated)
+
+    def test_unrelated_save_keeps_cache(self):
+        """Сохранение без смены пароля и is_active не сбрасывает кэш."""
+        url = reverse('posts:index')
+        self.client.get(url)
+        self.user.first_name = 'Кэш'
+        self.user.save()
+        response, queries = self.auth_queries(url)
+        self.assertEqual(queries, [])
+
+    def cached_user(self):
+        url = reverse('posts:index')
+        self.client.get(url)
+        return self.client.get(url).wsgi_request.user
+
+    def test_demotion_invalidates_cache(self):
+        """Снятие прав администратора видно со следующего запроса."""
+        user = User.objects.get(pk=self.user.pk)
+        user.is_staff = user.is_superuser = True
+        user.save()
+        self.assertTrue(self.cached_user().is_superuser)
+        user.is_staff = user.is_superuser = False
+        user.save()
+        user = self.client.get(reverse('posts:index')).wsgi_request.user
+        self.assertFalse(user.is_staff)
+        self.assertFalse(user.is_superuser)
+
+    def test_permission_changes_invalidate_cache(self):
+        """Группы и права пользователя и группы сбрасывают кэш."""
+        permission = Permission.objects.get(codename='change_post')
+        group = Group.objects.create(name='Редакторы')
+        user = User.objects.get(pk=self.user.pk)
+        user.groups.add(group)
+        self.assertFalse(self.cached_user().has_perm('posts.change_post'))
+        group.permissions.add(permission)
+        self.assertTrue(self.cached_user().has_perm('posts.change_post'))
+        group.permissions.remove(permission)
+        self.assertFalse(self.cached_user().has_perm('posts.change_post'))
+        user.user_permissions.add(permission)
+        self.assertTrue(self.cached_user().has_perm('posts.change_post'))
+        group.user_set.clear()
+        user.user_permissions.clear()
+        self.assertFalse(self.cached_user().has_perm('posts.change_post'))
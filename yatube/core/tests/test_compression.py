@@ -0,0 +1,111 @@
+import gzip
+import os
+import shutil
+import tempfile
+from unittest import skipUnless
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.compression import brotli
+from core.middleware import CompressionMiddleware
+from core.static import serve
+
+CSS = b'body { color: red; }\n' * 200
+
+
+@override_settings(COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def process(self, content, content_type='text/html', encoding='gzip'):
+        request = self.factory.get('/', HTTP_ACCEPT_ENCODING=encoding)
+        middleware = CompressionMiddleware(
+            lambda request: HttpResponse(content, content_type=content_type))
+        return middleware(request)
+
+    def test_large_html_compressed(self):
+        """Большой HTML сжимается."""
+        content = b'<p>Yatube</p>' * 500
+        response = self.process(content)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), content)
+
+    @skipUnless(brotli, 'brotli не установлен')
+    def test_brotli_preferred(self):
+        """Клиент, принимающий br, получает brotli."""
+        content = b'<p>Yatube</p>' * 500
+        response = self.process(content, encoding='gzip, deflate, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(brotli.decompress(response.content), content)
+
+    def test_small_response_untouched(self):
+        """Ответ меньше порога не сжимается."""
+        response = self.process(b'<p>Yatube</p>')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_event_stream_untouched(self):
+        """Поток событий не сжимается, чтобы не буферизоваться."""
+        response = self.process(b'data: 1\n\n' * 500, 'text/event-stream')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_compressed_types_untouched(self):
+        """Архивы и картинки уже сжаты и повторно не сжимаются."""
+        for content_type in ('application/zip', 'image/jpeg'):
+            with self.subTest(content_type=content_type):
+                response = self.process(b'\0' * 5000, content_type)
+                self.assertFalse(response.has_header('Content-Encoding'))
+
+
+class StaticPipelineTests(TestCase):
+    def setUp(self):
+        self.source = tempfile.mkdtemp()
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.source)
+        self.addCleanup(shutil.rmtree, self.root)
+        os.makedirs(os.path.join(self.source, 'css'))
+        with open(os.path.join(self.source, 'css', 'site.css'), 'wb') as f:
+            f.write(CSS)
+        settings = override_settings(
+            STATICFILES_DIRS=[self.source],
+            STATIC_ROOT=self.root,
+            STATICFILES_STORAGE=(
+                'core.storage.CompressedManifestStaticFilesStorage'),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def test_collectstatic_hashes_and_precompresses(self):
+        """collectstatic создает файлы с хешем и готовые .gz."""
+        call_command('collectstatic', interactive=False, verbosity=0)
+        hashed = staticfiles_storage.stored_name('css/site.css')
+        self.assertNotEqual(hashed, 'css/site.css')
+        with open(os.path.join(self.root, hashed + '.gz'), 'rb') as f:
+            self.assertEqual(gzip.decompress(f.read()), CSS)
+
+        request = RequestFactory().get(
+            '/static/' + hashed, HTTP_ACCEPT_ENCODING='gzip')
+        response = serve(request, hashed)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertIn('immutable', response['Cache-Control'])
+        response.close()
+
+    @skipUnless(brotli, 'brotli не установлен')
+    def test_collectstatic_brotli(self):
+        """collectstatic создает .br, и он отдается клиентам с br."""
+        call_command('collectstatic', interactive=False, verbosity=0)
+        hashed = staticfiles_storage.stored_name('css/site.css')
+        with open(os.path.join(self.root, hashed + '.br'), 'rb') as f:
+            self.assertEqual(brotli.decompress(f.read()), CSS)
+
+        request = RequestFactory().get(
+            '/static/' + hashed, HTTP_ACCEPT_ENCODING='gzip, br')
+        response = serve(request, hashed)
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['Content-Type'], 'text/css')
+        self.assertEqual(
+            brotli.decompress(b''.join(response.streaming_content)), CSS)
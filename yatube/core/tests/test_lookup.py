@@ -0,0 +1,81 @@
+from django.core.cache import cache
+from django.http import Http404
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.lookups import authors, groups
+from posts.models import Group, Post, User
+
+
+class LookupCacheTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.group = Group.objects.create(title='Группа', slug='lookup')
+        cls.user = User.objects.create_user(
+            username='Lookup', first_name='Иван')
+
+    def setUp(self):
+        cache.clear()
+        groups.clear()
+        authors.clear()
+
+    def test_hits_skip_database(self):
+        """Повторный поиск по slug и username не обращается к базе."""
+        self.assertEqual(groups.get('lookup'), self.group)
+        self.assertEqual(authors.get('Lookup'), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(groups.get('lookup').title, 'Группа')
+            self.assertEqual(authors.get('Lookup').get_full_name(), 'Иван')
+
+    def test_shared_cache_fallback(self):
+        """После очистки LRU процесса объект берется из общего кэша."""
+        groups.get('lookup')
+        groups.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(groups.get('lookup'), self.group)
+
+    def test_negative_cache(self):
+        """Несуществующий slug кэшируется, пока группа не создана."""
+        with self.assertRaises(Http404):
+            groups.get_or_404('ghost')
+        with self.assertNumQueries(0):
+            self.assertIsNone(groups.get('ghost'))
+        Group.objects.create(title='Призрак', slug='ghost')
+        self.assertEqual(groups.get('ghost').title, 'Призрак')
+
+    def test_negative_cache_from_shared_cache(self):
+        """Отсутствие, прочитанное из общего кэша, тоже дает None и 404."""
+        self.assertIsNone(groups.get('ghost'))
+        self.assertIsNone(authors.get('Ghost'))
+        groups.clear()
+        authors.clear()
+        with self.assertNumQueries(0):
+            self.assertIsNone(groups.get('ghost'))
+            self.assertIsNone(authors.get('Ghost'))
+        groups.clear()
+        response = self.client.get(
+            reverse('posts:group_list', args=('ghost',)))
+        self.assertEqual(response.status_code, 404)
+
+    def test_group_counters_not_cached(self):
+        """Счетчики группы читаются из базы, а не из кэша поиска."""
+        groups.get('lookup')
+        Post.objects.create(text='Пост', author=self.user, group=self.group)
+        self.assertEqual(groups.get('lookup').post_count, 1)
+
+    def test_invalidated_on_rename(self):
+        """Переименование сбрасывает и старый, и новый ключ."""
+        group = Group.objects.get(slug='lookup')
+        groups.get('lookup')
+        group.slug = 'renamed'
+        group.save()
+        self.assertIsNone(groups.get('lookup'))
+        self.assertEqual(groups.get('renamed'), self.group)
+
+    @override_settings(LOOKUP_CACHE_SIZE=1)
+    def test_lru_eviction(self):
+        """LRU процесса хранит не больше LOOKUP_CACHE_SIZE записей."""
+        groups.get('lookup')
+        groups.get('ghost')
+        self.assertEqual(list(groups.local), ['ghost'])
@@ -0,0 +1,76 @@
+from unittest import mock
+
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.mail import EmailQueue
+from posts.models import User
+
+
+class LocalSMTPBackend(EmailBackend):
+    """Заглушка SMTP: считает открытые соединения и хранит письма."""
+    opened = 0
+    outbox = []
+
+    def open(self):
+        LocalSMTPBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        LocalSMTPBackend.outbox.extend(messages)
+        return len(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='core.mail.QueuedEmailBackend',
+    EMAIL_QUEUE_BACKEND='core.tests.test_mail.LocalSMTPBackend',
+    EMAIL_QUEUE_BATCH_SIZE=50,
+    EMAIL_RATE_LIMIT=5,
+)
+class QueuedEmailTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(
+            username='Mail', email='mail@example.com', password='pass',
+        )
+
+    def setUp(self):
+        cache.clear()
+        LocalSMTPBackend.opened = 0
+        LocalSMTPBackend.outbox = []
+        self.queue = EmailQueue(autostart=False)
+        patcher = mock.patch('core.mail.email_queue', self.queue)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_batches_share_connection(self):
+        """Письма уходят пачками через одно соединение."""
+        for number in range(120):
+            mail.send_mail('Тема', 'Текст', None, [f'user{number}@x.ru'])
+        self.assertEqual(LocalSMTPBackend.outbox, [])
+        self.assertEqual(self.queue.flush(), 120)
+        self.assertEqual(len(LocalSMTPBackend.outbox), 120)
+        self.assertEqual(LocalSMTPBackend.opened, 1)
+
+    def test_rate_limit_per_recipient(self):
+        """На один адрес уходит не больше EMAIL_RATE_LIMIT писем."""
+        for _ in range(7):
+            mail.send_mail('Тема', 'Текст', None, ['Same@x.ru'])
+        mail.send_mail('Тема', 'Текст', None, ['other@x.ru'])
+        self.assertEqual(self.queue.flush(), 6)
+
+    def test_password_reset_only_enqueues(self):
+        """Сброс пароля не отправляет письмо в потоке запроса."""
+        response = Client().post(
+            reverse('users:password_reset_form'),
+            {'email': self.user.email},
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(LocalSMTPBackend.outbox, [])
+        self.queue.flush()
+        self.assertEqual(len(LocalSMTPBackend.outbox), 1)
+        self.assertEqual(LocalSMTPBackend.outbox[0].to, [self.user.email])
@@ -0,0 +1,30 @@
+from django.core.cache import cache
+from django.test import TransactionTestCase, override_settings
+
+from core.tasks import drain
+from posts import graph as graph_module
+from posts.graph import get_graph
+from posts.models import Follow, Post, PostScore, User
+
+
+@override_settings(BACKGROUND_WORKERS=1)
+class BackgroundWorkersTests(TransactionTestCase):
+    def setUp(self):
+        drain()
+        cache.clear()
+        self.addCleanup(drain)
+
+    def test_deferred_work_completes_in_pool(self):
+        """Рассылка, популярность и граф досчитываются в фоновом потоке."""
+        author = User.objects.create_user(username='Author')
+        follower = User.objects.create_user(username='Follower')
+        Follow.objects.create(user=follower, author=author)
+        graph = get_graph(refresh=True)
+        post = Post.objects.create(text='Пост', author=author)
+        with override_settings(FOLLOW_GRAPH_TTL=-1):
+            self.assertIs(get_graph(), graph)
+        drain()
+        self.assertEqual(follower.notifications.get().post, post)
+        self.assertTrue(PostScore.objects.filter(post=post).exists())
+        self.assertIsNot(graph_module.graph, graph)
+        self.assertFalse(graph_module.refreshing)
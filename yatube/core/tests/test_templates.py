@@ -0,0 +1,44 @@
+from django.core.cache import cache
+from django.template import Context, Template, TemplateSyntaxError
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from core.profiling import template_profiler
+from posts.models import Group, Post, User
+
+
+class TemplateTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Render')
+        cls.group = Group.objects.create(title='Группа', slug='render')
+        cls.post = Post.objects.create(
+            text='Текст поста', author=cls.user, group=cls.group,
+        )
+
+    def test_include_inline_renders_with_context(self):
+        """include_inline подставляет шаблон с переданным контекстом."""
+        template = Template(
+            '{% load inline %}'
+            "{% include_inline 'posts/includes/post_card.html' "
+            'with show_group=True %}'
+        )
+        html = template.render(Context({'post': self.post}))
+        self.assertIn('Текст поста', html)
+        self.assertNotIn('все записи группы', html)
+
+    def test_include_inline_requires_constant_name(self):
+        """Имя шаблона должно быть строкой."""
+        with self.assertRaises(TemplateSyntaxError):
+            Template('{% load inline %}{% include_inline name %}')
+
+    def test_profiler_reports_templates_and_tags(self):
+        """Профайлер показывает время по шаблонам и тегам."""
+        cache.clear()
+        with template_profiler() as profile:
+            Client().get(reverse('posts:index'))
+        self.assertIn('posts/includes/post_card.html', profile.templates)
+        self.assertIn('posts/index.html', profile.templates)
+        self.assertIn('URLNode', profile.tags)
+        self.assertIn('URLNode', profile.report())
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Group, Post, Comment, Follow
+from .models import Group, Post, Comment, Follow, Notification
 
 
 class PostAdmin(admin.ModelAdmin):
@@ -48,7 +48,20 @@ class FollowAdmin(admin.ModelAdmin):
     )
 
 
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = (
+        'pk',
+        'user',
+        'author',
+        'posts_count',
+        'is_read',
+        'created',
+    )
+    list_filter = ('is_read',)
+
+
 admin.site.register(Post, PostAdmin)
 admin.site.register(Group, GroupAdmin)
 admin.site.register(Comment, CommentAdmin)
 admin.site.register(Follow, FollowAdmin)
+admin.site.register(Notification, NotificationAdmin)
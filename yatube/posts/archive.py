@@ -0,0 +1,130 @@
+from collections import Counter
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.http import Http404
+from django.utils import timezone
+
+from .models import ArchiveBucket, Post
+from .urlbuilders import post_url
+
+CACHE_KEY = 'archive:{}'
+INDEX = 'index'
+
+
+def group_scope(group_id):
+    return f'group:{group_id}'
+
+
+def author_scope(author_id):
+    return f'author:{author_id}'
+
+
+def post_scopes(author_id, group_id):
+    scopes = [INDEX, author_scope(author_id)]
+    if group_id is not None:
+        scopes.append(group_scope(group_id))
+    return scopes
+
+
+def month_of(when):
+    when = timezone.localtime(when)
+    return when.year, when.month
+
+
+def month_range(year, month):
+    """Границы месяца в текущем часовом поясе."""
+    if not 1 <= month <= 12 or not 1 <= year <= 9998:
+        raise Http404('Такого месяца нет.')
+    start = datetime(year, month, 1)
+    end = datetime(year + month // 12, month % 12 + 1, 1)
+    return timezone.make_aware(start), timezone.make_aware(end)
+
+
+def adjust(scopes, when, delta):
+    """Меняет счетчики месяца на delta: два запроса на любое число лент."""
+    year, month = month_of(when)
+    with transaction.atomic():
+        ArchiveBucket.objects.bulk_create(
+            [
+                ArchiveBucket(scope=scope, year=year, month=month)
+                for scope in scopes
+            ],
+            ignore_conflicts=True,
+        )
+        ArchiveBucket.objects.filter(
+            scope__in=scopes, year=year, month=month,
+        ).update(count=F('count') + delta)
+    cache.delete_many([CACHE_KEY.format(scope) for scope in scopes])
+
+
+def post_added(post):
+    adjust(post_scopes(post.author_id, post.group_id), post.pub_date, 1)
+
+
+def post_removed(post):
+    adjust(post_scopes(post.author_id, post.group_id), post.pub_date, -1)
+
+
+def group_changed(post, old_group_id):
+    if old_group_id is not None:
+        adjust([group_scope(old_group_id)], post.pub_date, -1)
+    if post.group_id is not None:
+        adjust([group_scope(post.group_id)], post.pub_date, 1)
+
+
+def rebuild(chunk_size=None):
+    """Пересчитывает все счетчики одним проходом по постам;
+    возвращает число записанных строк."""
+    counts = Counter()
+    posts = Post.objects.order_by().values_list(
+        'author_id', 'group_id', 'pub_date')
+    for author_id, group_id, pub_date in posts.iterator():
+        for scope in post_scopes(author_id, group_id):
+            counts[scope, month_of(pub_date)] += 1
+    scopes = {scope for scope, _ in counts}
+    with transaction.atomic():
+        scopes.update(ArchiveBucket.objects.values_list('scope', flat=True))
+        ArchiveBucket.objects.all().delete()
+        ArchiveBucket.objects.bulk_create(
+            (
+                ArchiveBucket(scope=scope, year=year, month=month, count=count)
+                for (scope, (year, month)), count in counts.items()
+            ),
+            batch_size=chunk_size or settings.ARCHIVE_CHUNK_SIZE,
+        )
+    cache.delete_many([CACHE_KEY.format(scope) for scope in scopes])
+    return len(counts)
+
+
+def get_months(scope):
+    """Непустые месяцы ленты, от новых к старым: (год, месяц, постов)."""
+    key = CACHE_KEY.format(scope)
+    months = cache.get(key)
+    if months is None:
+        months = list(ArchiveBucket.objects.filter(
+            scope=scope, count__gt=0,
+        ).values_list('year', 'month', 'count'))
+        cache.set(key, months, settings.ARCHIVE_CACHE_TIMEOUT)
+    return months
+
+
+def month_count(scope, year, month):
+    for bucket_year, bucket_month, count in get_months(scope):
+        if (bucket_year, bucket_month) == (year, month):
+            return count
+    return 0
+
+
+def sidebar(scope, url_name, *args):
+    return [
+        {
+            'month': date(year, month, 1),
+            'count': count,
+            'url': post_url(url_name, *args, year, month),
+        }
+        for year, month, count in get_months(scope)
+    ]
@@ -0,0 +1,94 @@
+import json
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Max
+
+
+class Broker:
+    """Внутрипроцессный pub/sub, заменяющий внешний брокер сообщений."""
+
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.last_ids = {}
+
+    def publish(self, channels, post_id):
+        with self.condition:
+            for channel in channels:
+                self.last_ids[channel] = max(
+                    post_id, self.last_ids.get(channel, 0)
+                )
+            self.condition.notify_all()
+
+    def latest(self, channels):
+        return max(
+            (self.last_ids.get(channel, 0) for channel in channels),
+            default=0,
+        )
+
+    def wait(self, channels, cursor, timeout):
+        deadline = time.monotonic() + timeout
+        with self.condition:
+            latest = self.latest(channels)
+            while latest <= cursor:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+                latest = self.latest(channels)
+            return latest
+
+
+broker = Broker()
+
+
+def post_channels(post):
+    channels = ['index', f'author:{post.author_id}']
+    if post.group_id:
+        channels.append(f'group:{post.group_id}')
+    return channels
+
+
+def publish_post(post):
+    broker.publish(post_channels(post), post.id)
+
+
+def snapshot(posts, since):
+    """Ответ для короткого опроса: число постов новее since."""
+    posts = posts.order_by().filter(id__gt=since)
+    latest = posts.aggregate(latest=Max('id'))['latest']
+    return {
+        'count': posts.count() if latest else 0,
+        'since': since,
+        'latest': latest or since,
+        'retry': settings.FEED_EVENTS_POLL_INTERVAL * 1000,
+    }
+
+
+def format_event(latest, count, since):
+    data = json.dumps({'count': count, 'since': since, 'latest': latest})
+    return f'id: {latest}\nevent: new_posts\ndata: {data}\n\n'
+
+
+def event_stream(posts, channels, since, last_event_id=0):
+    """Сообщает о постах новее since, пока не истечет FEED_EVENTS_DURATION."""
+    posts = posts.order_by()
+    yield f'retry: {settings.FEED_EVENTS_RETRY}\n\n'
+    cursor = max(since, last_event_id)
+    latest = posts.filter(id__gt=cursor).aggregate(
+        latest=Max('id'))['latest']
+    deadline = time.monotonic() + settings.FEED_EVENTS_DURATION
+    while True:
+        if latest and latest > cursor:
+            count = posts.filter(id__gt=since).count()
+            yield format_event(latest, count, since)
+            cursor = latest
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        latest = broker.wait(
+            channels, cursor, min(settings.FEED_EVENTS_KEEPALIVE, remaining)
+        )
+        if latest <= cursor:
+            yield ': keepalive\n\n'
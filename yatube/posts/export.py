@@ -0,0 +1,95 @@
+import json
+import zipfile
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.serializers.json import DjangoJSONEncoder
+
+
+class ZipStream:
+    """Файл только для записи: zipfile пишет в буфер, генератор забирает
+    из него байты. Без seek() zipfile пишет размеры после данных."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.position = 0
+
+    def write(self, data):
+        self.buffer += data
+        self.position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self.position
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def ndjson(rows):
+    for row in rows:
+        yield json.dumps(
+            row, cls=DjangoJSONEncoder, ensure_ascii=False).encode() + b'\n'
+
+
+def post_rows(user):
+    posts = user.posts.select_related('group').order_by('pk').only(
+        'id', 'text', 'pub_date', 'image', 'group__slug')
+    for post in posts.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        yield {
+            'id': post.id,
+            'text': post.text,
+            'pub_date': post.pub_date,
+            'group': post.group.slug if post.group else None,
+            'image': post.image.name or None,
+        }
+
+
+def comment_rows(user):
+    comments = user.comments.order_by('pk').values(
+        'id', 'post_id', 'text', 'created')
+    yield from comments.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE)
+
+
+def image_chunks(name):
+    with default_storage.open(name) as image:
+        yield from image.chunks(settings.EXPORT_BUFFER_SIZE)
+
+
+def image_names(user):
+    names = user.posts.exclude(image='').order_by('pk').values_list(
+        'image', flat=True)
+    for name in names.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        if default_storage.exists(name):
+            yield name
+
+
+def write_entry(archive, stream, name, chunks):
+    with archive.open(name, 'w', force_zip64=True) as entry:
+        for chunk in chunks:
+            entry.write(chunk)
+            if len(stream.buffer) >= settings.EXPORT_BUFFER_SIZE:
+                yield stream.pop()
+
+
+def export_zip(user):
+    """
+    ZIP с постами и комментариями пользователя в NDJSON и картинками
+    постов. Архив собирается по ходу отдачи: строки читаются через
+    iterator(), в памяти держится не больше EXPORT_BUFFER_SIZE байт
+    сжатых данных.
+    """
+    stream = ZipStream()
+    with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as archive:
+        yield from write_entry(
+            archive, stream, 'posts.ndjson', ndjson(post_rows(user)))
+        yield from write_entry(
+            archive, stream, 'comments.ndjson', ndjson(comment_rows(user)))
+        for name in image_names(user):
+            yield from write_entry(archive, stream, name, image_chunks(name))
+    yield stream.pop()
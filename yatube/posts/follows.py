@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from core.tasks import defer
+
+from .models import Follow, User
+from .trending import follow_gained
+from .utils import chunked
+
+
+def follow_sql():
+    ops = connection.ops
+    qn = ops.quote_name
+    user_pk = qn(User._meta.pk.column)
+    return (
+        f'{ops.insert_statement(ignore_conflicts=True)} '
+        f'{qn(Follow._meta.db_table)} '
+        f'({qn(Follow._meta.get_field("user").column)}, '
+        f'{qn(Follow._meta.get_field("author").column)}, '
+        f'{qn(Follow._meta.get_field("created").column)}) '
+        f'SELECT %s, {user_pk}, %s FROM {qn(User._meta.db_table)} '
+        f'WHERE {qn(User._meta.get_field("username").column)} = %s '
+        f'AND {user_pk} <> %s '
+        f'{ops.ignore_conflicts_suffix_sql(ignore_conflicts=True)}'
+    )
+
+
+def follow(user, username):
+    """Подписка одним INSERT ... SELECT; повтор и подписка на себя
+    ничего не вставляют."""
+    created = timezone.now()
+    with connection.cursor() as cursor:
+        cursor.execute(follow_sql(), [
+            user.pk, Follow._meta.get_field('created').get_db_prep_value(
+                created, connection),
+            username, user.pk,
+        ])
+        followed = cursor.rowcount > 0
+    if followed:
+        defer(follow_gained, username, created)
+    return followed
+
+
+def unfollow(user, username):
+    deleted, _ = Follow.objects.filter(
+        user=user, author__username=username).delete()
+    return deleted > 0
+
+
+def author_exists(username):
+    return User.objects.filter(username=username).exists()
+
+
+def bulk_follow(user, usernames):
+    """Подписывает на авторов пачками; возвращает ненайденные имена."""
+    usernames = list(dict.fromkeys(usernames))
+    found = set()
+    for chunk in chunked(usernames, settings.FOLLOW_BULK_CHUNK_SIZE):
+        authors = dict(
+            User.objects.filter(username__in=chunk)
+            .values_list('username', 'pk')
+        )
+        found.update(authors)
+        Follow.objects.bulk_create(
+            (Follow(user_id=user.pk, author_id=author_id)
+             for author_id in authors.values() if author_id != user.pk),
+            ignore_conflicts=True,
+        )
+    return [username for username in usernames if username not in found]
@@ -0,0 +1,110 @@
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from django.conf import settings
+
+from core.tasks import submit
+
+from .models import Follow
+
+
+class Adjacency:
+    """Списки смежности в формате CSR: соседи вершины node лежат в
+    targets[offsets[index]:offsets[index + 1]], index ищется в nodes."""
+
+    def __init__(self, edges):
+        self.nodes = array('q')
+        self.offsets = array('q', [0])
+        self.targets = array('q')
+        for source, target in edges:
+            if not self.nodes or self.nodes[-1] != source:
+                if self.nodes:
+                    self.offsets.append(len(self.targets))
+                self.nodes.append(source)
+            self.targets.append(target)
+        if self.nodes:
+            self.offsets.append(len(self.targets))
+
+    def __getitem__(self, node):
+        index = bisect_left(self.nodes, node)
+        if index == len(self.nodes) or self.nodes[index] != node:
+            return self.targets[0:0]
+        return self.targets[self.offsets[index]:self.offsets[index + 1]]
+
+
+class FollowGraph:
+    def __init__(self):
+        follows = Follow.objects.values_list('user_id', 'author_id')
+        chunk_size = settings.FOLLOW_GRAPH_CHUNK_SIZE
+        self.following = Adjacency(
+            follows.order_by('user_id', 'author_id').iterator(chunk_size))
+        self.followers = Adjacency(
+            (author, user) for user, author
+            in follows.order_by('author_id', 'user_id').iterator(chunk_size)
+        )
+        self.built = time.monotonic()
+
+    def mutual(self, user_id):
+        """Авторы, которые подписаны на пользователя в ответ."""
+        followers = set(self.followers[user_id])
+        return [
+            author for author in self.following[user_id]
+            if author in followers
+        ]
+
+    def suggestions(self, user_id, limit=None):
+        """Авторы, на которых подписаны авторы пользователя,
+        по числу таких подписок."""
+        following = set(self.following[user_id])
+        counts = Counter(
+            candidate
+            for author in following
+            for candidate in self.following[author]
+            if candidate != user_id and candidate not in following
+        )
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit or settings.FOLLOW_SUGGESTIONS]
+
+
+lock = threading.Lock()
+graph = None
+refreshing = False
+
+
+def rebuild():
+    global graph, refreshing
+    try:
+        fresh = FollowGraph()
+        with lock:
+            graph = fresh
+    finally:
+        refreshing = False
+
+
+def get_graph(refresh=False):
+    """
+    Граф строится заново раз в FOLLOW_GRAPH_TTL секунд. Пока один поток
+    перестраивает устаревший граф в фоне, остальные получают старый;
+    ждать построения приходится только первому запросу процесса.
+    """
+    global refreshing
+    with lock:
+        current = graph
+        expired = (
+            current is not None
+            and time.monotonic() - current.built > settings.FOLLOW_GRAPH_TTL
+        )
+        if current is not None and not refresh and not expired:
+            return current
+        if expired and not refresh:
+            if refreshing:
+                return current
+            refreshing = True
+    if current is None or refresh:
+        rebuild()
+    else:
+        submit(rebuild)
+    return graph
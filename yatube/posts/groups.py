@@ -0,0 +1,114 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    Case, Count, DateTimeField, F, Max, OuterRef, Q, Subquery, Value, When,
+)
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Group, Post
+from .utils import decode_cursor, encode_cursor
+
+VERSION_CACHE_KEY = 'groups:version'
+PAGE_CACHE_KEY = 'groups:{}:{}:{}'
+
+SORTS = {
+    'activity': 'last_post_at',
+    'posts': 'post_count',
+}
+
+
+def post_added(group_id, pub_date, newest=True):
+    """Учитывает пост в счетчиках группы без обхода ее постов. Новый пост
+    всегда самый свежий; перенесенный сравнивается с last_post_at."""
+    if group_id is None:
+        return
+    last_post_at = Value(pub_date, output_field=DateTimeField())
+    if not newest:
+        last_post_at = Greatest(Coalesce('last_post_at', last_post_at),
+                                last_post_at)
+    Group.objects.filter(pk=group_id).update(
+        post_count=F('post_count') + 1,
+        last_post_at=last_post_at,
+    )
+    invalidate()
+
+
+def post_removed(group_id, pub_date):
+    """Вычитает пост из счетчиков; last_post_at ищется заново, только
+    если убран самый свежий пост группы."""
+    if group_id is None:
+        return
+    latest = Post.objects.filter(group=OuterRef('pk')).order_by(
+        '-pub_date').values('pub_date')[:1]
+    Group.objects.filter(pk=group_id, post_count__gt=0).update(
+        post_count=F('post_count') - 1,
+        last_post_at=Case(
+            When(last_post_at=pub_date, then=Subquery(latest)),
+            default=F('last_post_at'),
+        ),
+    )
+    invalidate()
+
+
+def recount(group_ids=None):
+    """Пересчитывает post_count и last_post_at с нуля одним UPDATE."""
+    posts = Post.objects.filter(group=OuterRef('pk')).order_by().values(
+        'group')
+    groups = Group.objects.all()
+    if group_ids is not None:
+        groups = groups.filter(pk__in=group_ids)
+    updated = groups.update(
+        post_count=Coalesce(Subquery(
+            posts.annotate(count=Count('pk')).values('count')), 0),
+        last_post_at=Subquery(
+            posts.annotate(last=Max('pub_date')).values('last')),
+    )
+    invalidate()
+    return updated
+
+
+def invalidate():
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, 1, None)
+
+
+def after(field, value, group_id):
+    if value is None:
+        return Q(**{f'{field}__isnull': True, 'id__lt': group_id})
+    return (
+        Q(**{f'{field}__lt': value})
+        | Q(**{field: value, 'id__lt': group_id})
+        | Q(**{f'{field}__isnull': True})
+    )
+
+
+def get_page(sort, cursor):
+    """Страница каталога групп по курсору (значение сортировки, id)."""
+    field = SORTS[sort]
+    groups = Group.objects.order_by(
+        F(field).desc(nulls_last=True), '-id')
+    position = decode_cursor(cursor or '', field == 'last_post_at')
+    if position:
+        groups = groups.filter(after(field, *position))
+    size = settings.GROUPS_PER_PAGE
+    page = list(groups[:size + 1])
+    next_cursor = None
+    if len(page) > size:
+        last = page[size - 1]
+        next_cursor = encode_cursor(getattr(last, field), last.id)
+    return page[:size], next_cursor
+
+
+def get_cached_page(sort, cursor):
+    version = cache.get_or_set(VERSION_CACHE_KEY, 1, None)
+    key = PAGE_CACHE_KEY.format(
+        version, sort, hashlib.md5((cursor or '').encode()).hexdigest())
+    page = cache.get(key)
+    if page is None:
+        page = get_page(sort, cursor)
+        cache.set(key, page, settings.GROUPS_CACHE_TIMEOUT)
+    return page
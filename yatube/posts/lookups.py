@@ -0,0 +1,11 @@
+from core.lookup import LookupCache
+
+from .models import Group, User
+
+# Счетчики групп меняются через UPDATE без сигналов и в кэш не попадают.
+groups = LookupCache(
+    Group, 'slug', only=('id', 'title', 'slug', 'description'),
+)
+authors = LookupCache(
+    User, 'username', only=('id', 'username', 'first_name', 'last_name'),
+)
@@ -0,0 +1,35 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from posts.models import Post
+
+
+def fetched_bytes(queryset):
+    """Объем значений, которые база отдает на страницу ленты."""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return sum(
+        len(value) if isinstance(value, bytes)
+        else len(str(value).encode())
+        for row in rows for value in row if value is not None
+    ), len(rows)
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает объем данных страницы ленты до и после for_list().'
+
+    def handle(self, **options):
+        page = slice(0, settings.POST_PER_PAGE)
+        cases = (
+            ('select_related', Post.objects.select_related(
+                'author', 'group')[page]),
+            ('for_list', Post.objects.for_list()[page]),
+        )
+        results = [(name, *fetched_bytes(qs)) for name, qs in cases]
+        for name, size, rows in results:
+            self.stdout.write(f'{name:<15} {rows} постов: {size} байт')
+        ratio = results[0][1] / max(results[1][1], 1)
+        self.stdout.write(f'экономия: x{ratio:.1f}')
@@ -0,0 +1,36 @@
+from timeit import timeit
+
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from posts.urlbuilders import post_url
+
+CASES = (
+    ('group_list', ('test-slug',)),
+    ('profile', ('Иван',)),
+    ('post_detail', (42,)),
+)
+
+
+class Command(BaseCommand):
+    help = 'Сравнивает reverse() с готовыми построителями адресов posts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=100000)
+
+    def handle(self, number, **options):
+        for name, args in CASES:
+            expected = reverse(f'posts:{name}', args=args)
+            if post_url(name, *args) != expected:
+                raise CommandError(
+                    f'{name}: post_url вернул {post_url(name, *args)}, '
+                    f'reverse() — {expected}'
+                )
+            reversed_time = timeit(
+                lambda: reverse(f'posts:{name}', args=args), number=number)
+            built_time = timeit(lambda: post_url(name, *args), number=number)
+            self.stdout.write(
+                f'{name:<12} reverse: {reversed_time / number * 1e6:6.2f} мкс'
+                f'  post_url: {built_time / number * 1e6:6.2f} мкс'
+                f'  x{reversed_time / built_time:.1f}'
+            )
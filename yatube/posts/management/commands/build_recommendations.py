@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from posts.recommendations import build_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает рекомендации авторов для всех пользователей.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int)
+
+    def handle(self, chunk_size, **options):
+        written = build_recommendations(chunk_size)
+        self.stdout.write(f'Записано рекомендаций: {written}')
@@ -0,0 +1,31 @@
+import argparse
+
+from django.core.management.base import BaseCommand, CommandError
+
+from posts.follows import bulk_follow
+from posts.models import User
+
+
+class Command(BaseCommand):
+    help = 'Подписывает пользователя на авторов из списка или файла.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+        parser.add_argument('authors', nargs='*')
+        parser.add_argument(
+            '--file', type=argparse.FileType(encoding='utf-8'),
+            help='Файл с именами авторов, по одному в строке.',
+        )
+
+    def handle(self, username, authors, file, **options):
+        try:
+            user = User.objects.get(username=username)
+        except User.DoesNotExist:
+            raise CommandError(f'Пользователь {username} не найден.')
+        if file is not None:
+            authors += [line.strip() for line in file if line.strip()]
+        missing = bulk_follow(user, authors)
+        for author in missing:
+            self.stderr.write(f'Автор {author} не найден.')
+        self.stdout.write(
+            f'Обработано авторов: {len(set(authors)) - len(missing)}')
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from posts.tags import backfill
+
+
+class Command(BaseCommand):
+    help = 'Заполняет хештеги и упоминания для всех постов пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int)
+
+    def handle(self, chunk_size, **options):
+        self.stdout.write(f'Проиндексировано постов: {backfill(chunk_size)}')
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from posts.archive import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счетчики архива по месяцам с нуля.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int)
+
+    def handle(self, chunk_size, **options):
+        self.stdout.write(f'Записано счетчиков: {rebuild(chunk_size)}')
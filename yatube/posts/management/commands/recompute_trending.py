@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from posts.trending import recompute
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает популярность постов и групп с нуля.'
+
+    def handle(self, **options):
+        self.stdout.write(f'Пересчитано постов: {recompute()}')
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from posts.groups import recount
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счетчики постов всех групп с нуля.'
+
+    def handle(self, **options):
+        self.stdout.write(f'Пересчитано групп: {recount()}')
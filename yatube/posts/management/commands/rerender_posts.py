@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+from posts.text import VERSION, rerender
+
+
+class Command(BaseCommand):
+    help = 'Перерисовывает HTML постов, сохраненных старой версией разметки.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500)
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Перерисовать все посты, а не только устаревшие.',
+        )
+
+    def handle(self, chunk_size, all, **options):
+        posts = Post.objects.all()
+        if all:
+            posts.update(text_version=0)
+        updated = rerender(posts, chunk_size)
+        self.stdout.write(
+            f'Перерисовано постов: {updated} (версия разметки {VERSION})')
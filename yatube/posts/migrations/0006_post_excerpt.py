@@ -0,0 +1,33 @@
+# Generated by Django 2.2.16 on 2026-10-19 19:59
+
+import core.fields
+from django.db import migrations
+
+
+def fill_excerpts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    field = Post._meta.get_field('excerpt')
+    batch = []
+    for post in Post.objects.only('id', 'text').iterator():
+        post.excerpt = field.make_excerpt(post.text)
+        batch.append(post)
+        if len(batch) == 500:
+            Post.objects.bulk_update(batch, ['excerpt'])
+            batch = []
+    Post.objects.bulk_update(batch, ['excerpt'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_group_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt',
+            field=core.fields.ExcerptField(blank=True, editable=False, length=300, source='text', verbose_name='Начало текста'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
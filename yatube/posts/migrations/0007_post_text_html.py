@@ -0,0 +1,48 @@
+# Generated by Django 2.2.16 on 2026-10-19 20:01
+
+import core.fields
+from django.db import migrations
+
+
+def render_posts(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    fields = [
+        Post._meta.get_field(name)
+        for name in ('text_html', 'excerpt_html', 'text_version')
+    ]
+    names = [field.name for field in fields]
+    batch = []
+    for post in Post.objects.only('id', 'text', 'excerpt').iterator():
+        for field in fields:
+            field.pre_save(post, False)
+        batch.append(post)
+        if len(batch) == 500:
+            Post.objects.bulk_update(batch, names)
+            batch = []
+    Post.objects.bulk_update(batch, names)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_post_excerpt'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_html',
+            field=core.fields.RenderedField(blank=True, editable=False, renderer='posts.text.render', source='excerpt', verbose_name='Начало текста в HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_html',
+            field=core.fields.RenderedField(blank=True, editable=False, renderer='posts.text.render', source='text', verbose_name='Текст поста в HTML'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='text_version',
+            field=core.fields.VersionField(default=0, editable=False, verbose_name='Версия разметки текста', version='posts.text.VERSION'),
+        ),
+        migrations.RunPython(render_posts, migrations.RunPython.noop),
+    ]
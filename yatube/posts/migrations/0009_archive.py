@@ -0,0 +1,57 @@
+# Generated by Django 2.2.16 on 2026-10-19 20:05
+
+from collections import Counter
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill_buckets(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    ArchiveBucket = apps.get_model('posts', 'ArchiveBucket')
+    counts = Counter()
+    posts = Post.objects.order_by().values_list(
+        'author_id', 'group_id', 'pub_date')
+    for author_id, group_id, pub_date in posts.iterator():
+        pub_date = timezone.localtime(pub_date)
+        month = pub_date.year, pub_date.month
+        counts['index', month] += 1
+        counts[f'author:{author_id}', month] += 1
+        if group_id is not None:
+            counts[f'group:{group_id}', month] += 1
+    ArchiveBucket.objects.bulk_create(
+        (
+            ArchiveBucket(scope=scope, year=year, month=month, count=count)
+            for (scope, (year, month)), count in counts.items()
+        ),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_tags_mentions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchiveBucket',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=50, verbose_name='Лента')),
+                ('year', models.PositiveSmallIntegerField(verbose_name='Год')),
+                ('month', models.PositiveSmallIntegerField(verbose_name='Месяц')),
+                ('count', models.IntegerField(default=0, verbose_name='Количество постов')),
+            ],
+            options={
+                'verbose_name_plural': 'Класс архива по месяцам',
+                'ordering': ('-year', '-month'),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='archivebucket',
+            constraint=models.UniqueConstraint(fields=('scope', 'year', 'month'), name='unique_bucket'),
+        ),
+        migrations.RunPython(fill_buckets, migrations.RunPython.noop),
+    ]
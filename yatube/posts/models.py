@@ -1,8 +1,23 @@
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db import models
+from django.utils import timezone
+
+from core.fields import ExcerptField, RenderedField, VersionField
+
+from .urlbuilders import post_url
 
 User = get_user_model()
 
+LIST_FIELDS = (
+    'id', 'pub_date', 'image', 'excerpt_html', 'author', 'group',
+    'author__username', 'author__first_name', 'author__last_name',
+    'group__slug', 'group__title',
+)
+
+
+COUNTER_FIELDS = ('post_count', 'last_post_at')
+
 
 class Group(models.Model):
     title = models.CharField(
@@ -15,13 +30,40 @@ class Group(models.Model):
         verbose_name='Адресс группы'
     )
     description = models.TextField(verbose_name='Описание группы')
+    post_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество постов',
+    )
+    last_post_at = models.DateTimeField(
+        null=True,
+        editable=False,
+        verbose_name='Дата последнего поста',
+    )
 
     class Meta:
+        indexes = [
+            models.Index(fields=['-last_post_at', '-id']),
+            models.Index(fields=['-post_count', '-id']),
+        ]
         verbose_name_plural = 'Группы'
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        # Счетчики ведет posts.groups через UPDATE; значения в памяти
+        # могут устареть, поэтому при изменении группы они не пишутся.
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in COUNTER_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    def get_absolute_url(self):
+        return post_url('group_list', self.slug)
+
 
 class Follow(models.Model):
     user = models.ForeignKey(
@@ -36,6 +78,10 @@ class Follow(models.Model):
         related_name='following',
         verbose_name='Пользователья на которого подписываются',
     )
+    created = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Дата подписки',
+    )
 
     class Meta:
         constraints = [
@@ -52,6 +98,18 @@ class Follow(models.Model):
         return f'{self.author}, {self.user}'
 
 
+class PostQuerySet(models.QuerySet):
+    def for_list(self, *related):
+        """Только поля карточки поста: без полного текста и без
+        лишних колонок автора."""
+        related = related or ('author', 'group')
+        fields = [
+            field for field in LIST_FIELDS
+            if '__' not in field or field.split('__')[0] in related
+        ]
+        return self.select_related(*related).only(*fields)
+
+
 class Post(models.Model):
     text = models.TextField(
         verbose_name='Текст поста',
@@ -81,6 +139,41 @@ class Post(models.Model):
         upload_to='posts/',
         blank=True,
     )
+    excerpt = ExcerptField(
+        source='text',
+        length=settings.POST_EXCERPT_LENGTH,
+        verbose_name='Начало текста',
+    )
+    text_html = RenderedField(
+        source='text',
+        renderer='posts.text.render',
+        verbose_name='Текст поста в HTML',
+    )
+    excerpt_html = RenderedField(
+        source='excerpt',
+        renderer='posts.text.render',
+        verbose_name='Начало текста в HTML',
+    )
+    text_version = VersionField(
+        version='posts.text.VERSION',
+        verbose_name='Версия разметки текста',
+    )
+    tags = models.ManyToManyField(
+        'Tag',
+        through='PostTag',
+        related_name='posts',
+        blank=True,
+        verbose_name='Хештеги',
+    )
+    mentioned = models.ManyToManyField(
+        User,
+        through='Mention',
+        related_name='mentioned_in',
+        blank=True,
+        verbose_name='Упомянутые пользователи',
+    )
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
@@ -89,6 +182,9 @@ class Post(models.Model):
     def __str__(self):
         return self.text[:15]
 
+    def get_absolute_url(self):
+        return post_url('post_detail', self.id)
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -119,3 +215,249 @@ class Comment(models.Model):
 
     def __str__(self: str) -> str:
         return self.text
+
+
+class Notification(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name='Получатель уведомления',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор новых постов',
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name='Последний пост',
+    )
+    posts_count = models.PositiveIntegerField(
+        default=1,
+        verbose_name='Количество новых постов',
+    )
+    is_read = models.BooleanField(
+        default=False,
+        verbose_name='Прочитано',
+    )
+    created = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='Дата уведомления',
+    )
+
+    class Meta:
+        ordering = ('-created',)
+        indexes = [
+            models.Index(fields=['user', 'is_read']),
+        ]
+        verbose_name_plural = 'Класс уведомления'
+
+    def __str__(self):
+        return f'{self.user}, {self.author}, {self.posts_count}'
+
+
+class UnreadCounter(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='unread_counter',
+        verbose_name='Пользователь',
+    )
+    count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Непрочитанные уведомления',
+    )
+
+    class Meta:
+        verbose_name_plural = 'Класс счетчика уведомлений'
+
+    def __str__(self):
+        return f'{self.user}, {self.count}'
+
+
+class Recommendation(models.Model):
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='recommendations',
+        verbose_name='Пользователь',
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Рекомендуемый автор',
+    )
+    rank = models.PositiveSmallIntegerField(
+        verbose_name='Место в рекомендациях',
+    )
+    score = models.FloatField(
+        verbose_name='Оценка',
+    )
+
+    class Meta:
+        ordering = ('rank',)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'rank'], name='unique_recommendation_rank',
+            ),
+        ]
+        verbose_name_plural = 'Класс рекомендаций'
+
+    def __str__(self):
+        return f'{self.user}, {self.author}, {self.rank}'
+
+
+class PostScore(models.Model):
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name='Пост',
+    )
+    score = models.FloatField(
+        db_index=True,
+        verbose_name='Популярность',
+    )
+
+    class Meta:
+        verbose_name_plural = 'Класс популярности постов'
+
+    def __str__(self):
+        return f'{self.post_id}, {self.score}'
+
+
+class GroupScore(models.Model):
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='trending',
+        verbose_name='Группа',
+    )
+    score = models.FloatField(
+        db_index=True,
+        verbose_name='Популярность',
+    )
+
+    class Meta:
+        verbose_name_plural = 'Класс популярности групп'
+
+    def __str__(self):
+        return f'{self.group_id}, {self.score}'
+
+
+class Tag(models.Model):
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name='Хештег',
+    )
+
+    class Meta:
+        verbose_name_plural = 'Хештеги'
+
+    def __str__(self):
+        return f'#{self.name}'
+
+    def get_absolute_url(self):
+        return post_url('tag_posts', self.name)
+
+
+class PostTag(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='tag_links',
+        verbose_name='Пост',
+    )
+    tag = models.ForeignKey(
+        Tag,
+        on_delete=models.CASCADE,
+        related_name='post_links',
+        verbose_name='Хештег',
+    )
+    pub_date = models.DateTimeField(
+        verbose_name='Дата публикации поста',
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'tag'], name='unique_post_tag',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['tag', '-pub_date', '-post']),
+        ]
+        verbose_name_plural = 'Класс хештегов поста'
+
+    def __str__(self):
+        return f'{self.post_id}, {self.tag_id}'
+
+
+class Mention(models.Model):
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='mention_links',
+        verbose_name='Пост',
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='mentions',
+        verbose_name='Упомянутый пользователь',
+    )
+    pub_date = models.DateTimeField(
+        verbose_name='Дата публикации поста',
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['post', 'user'], name='unique_post_mention',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-pub_date', '-post']),
+        ]
+        verbose_name_plural = 'Класс упоминаний'
+
+    def __str__(self):
+        return f'{self.post_id}, {self.user_id}'
+
+
+class ArchiveBucket(models.Model):
+    scope = models.CharField(
+        max_length=50,
+        verbose_name='Лента',
+    )
+    year = models.PositiveSmallIntegerField(
+        verbose_name='Год',
+    )
+    month = models.PositiveSmallIntegerField(
+        verbose_name='Месяц',
+    )
+    count = models.IntegerField(
+        default=0,
+        verbose_name='Количество постов',
+    )
+
+    class Meta:
+        ordering = ('-year', '-month')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope', 'year', 'month'], name='unique_bucket',
+            ),
+        ]
+        verbose_name_plural = 'Класс архива по месяцам'
+
+    def __str__(self):
+        return f'{self.scope}, {self.year}-{self.month:02}: {self.count}'
@@ -0,0 +1,95 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Follow, Notification, Post, UnreadCounter
+from .utils import chunked
+
+UNREAD_CACHE_KEY = 'notifications:unread:{}'
+
+
+def digest(user_ids, post):
+    """Добавляет пост к непрочитанным уведомлениям об авторе."""
+    unread = Notification.objects.filter(
+        user_id__in=user_ids, author_id=post.author_id, is_read=False,
+    )
+    digested = set(unread.values_list('user_id', flat=True))
+    unread.update(
+        posts_count=F('posts_count') + 1,
+        post_id=post.id,
+        created=timezone.now(),
+    )
+    return digested
+
+
+def notify_followers(post_id):
+    post = Post.objects.only('id', 'author_id').filter(pk=post_id).first()
+    if post is None:
+        return
+    followers = Follow.objects.filter(
+        author_id=post.author_id,
+    ).order_by('user_id').values_list('user_id', flat=True)
+    for chunk in chunked(
+        followers.iterator(), settings.NOTIFICATION_CHUNK_SIZE
+    ):
+        with transaction.atomic():
+            digested = (
+                digest(chunk, post) if settings.NOTIFICATION_DIGEST
+                else set()
+            )
+            fresh = [user_id for user_id in chunk if user_id not in digested]
+            Notification.objects.bulk_create(
+                Notification(user_id=user_id, author_id=post.author_id,
+                             post_id=post.id)
+                for user_id in fresh
+            )
+            UnreadCounter.objects.bulk_create(
+                (UnreadCounter(user_id=user_id) for user_id in fresh),
+                ignore_conflicts=True,
+            )
+            UnreadCounter.objects.filter(user_id__in=fresh).update(
+                count=F('count') + 1,
+            )
+        cache.delete_many(UNREAD_CACHE_KEY.format(user) for user in fresh)
+
+
+def unread_count(user):
+    if not user.is_authenticated:
+        return 0
+    key = UNREAD_CACHE_KEY.format(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = UnreadCounter.objects.filter(user_id=user.pk).values_list(
+            'count', flat=True,
+        ).first() or 0
+        cache.set(key, count)
+    return count
+
+
+def mark_read(user, notification_ids):
+    """Помечает прочитанными только показанные уведомления."""
+    with transaction.atomic():
+        marked = Notification.objects.filter(
+            user=user, is_read=False, pk__in=notification_ids,
+        ).update(is_read=True)
+        if marked:
+            UnreadCounter.objects.filter(user=user).update(
+                count=F('count') - marked,
+            )
+    cache.delete(UNREAD_CACHE_KEY.format(user.pk))
+
+
+def post_removed(post_id):
+    """Вместе с постом каскадно удаляются его уведомления: непрочитанные
+    нужно вычесть из счетчиков получателей."""
+    user_ids = list(Notification.objects.filter(
+        post_id=post_id, is_read=False,
+    ).values_list('user_id', flat=True))
+    if not user_ids:
+        return
+    UnreadCounter.objects.filter(
+        user_id__in=user_ids, count__gt=0,
+    ).update(count=F('count') - 1)
+    cache.delete_many(UNREAD_CACHE_KEY.format(user) for user in user_ids)
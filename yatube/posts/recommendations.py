@@ -0,0 +1,102 @@
+import heapq
+from collections import Counter, defaultdict
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+
+from .graph import FollowGraph
+from .models import Comment, Post, Recommendation, User
+from .utils import chunked
+
+CACHE_KEY = 'recommendations:{}'
+
+
+def group_activity():
+    """Группы, в которых пользователь писал посты или комментарии,
+    и до RECOMMENDATIONS_AUTHORS_PER_GROUP самых активных авторов
+    каждой группы."""
+    user_groups = defaultdict(set)
+    group_authors = defaultdict(list)
+    posts = Post.objects.filter(group__isnull=False).values_list(
+        'group_id', 'author_id').annotate(posts=Count('id')).order_by(
+        'group_id', '-posts', 'author_id')
+    for group_id, author_id, _ in posts.iterator():
+        user_groups[author_id].add(group_id)
+        authors = group_authors[group_id]
+        if len(authors) < settings.RECOMMENDATIONS_AUTHORS_PER_GROUP:
+            authors.append(author_id)
+    comments = Comment.objects.filter(post__group__isnull=False).values_list(
+        'author_id', 'post__group_id').distinct()
+    for user_id, group_id in comments.iterator():
+        user_groups[user_id].add(group_id)
+    return user_groups, group_authors
+
+
+def score_user(user_id, graph, user_groups, group_authors):
+    """Совместные подписки: авторы, на которых подписаны читатели тех же
+    авторов, плюс активные авторы из групп пользователя. У каждого
+    автора берутся первые RECOMMENDATIONS_READERS_PER_AUTHOR читателей,
+    у каждого читателя — первые RECOMMENDATIONS_AUTHORS_PER_READER
+    подписок, чтобы популярные авторы не делали обход квадратичным."""
+    following = set(graph.following[user_id])
+    scores = Counter()
+    for author in following:
+        readers = (
+            reader for reader in graph.followers[author] if reader != user_id
+        )
+        for reader in islice(
+                readers, settings.RECOMMENDATIONS_READERS_PER_AUTHOR):
+            scores.update(graph.following[reader][
+                :settings.RECOMMENDATIONS_AUTHORS_PER_READER])
+    for group_id in user_groups.get(user_id, ()):
+        for author in group_authors[group_id]:
+            scores[author] += settings.RECOMMENDATIONS_GROUP_WEIGHT
+    for author in following | {user_id}:
+        scores.pop(author, None)
+    return heapq.nsmallest(
+        settings.RECOMMENDATIONS_TOP_K, scores.items(),
+        key=lambda item: (-item[1], item[0]),
+    )
+
+
+def build_recommendations(chunk_size=None):
+    """Пересчитывает рекомендации пачками пользователей;
+    возвращает число записанных строк."""
+    graph = FollowGraph()
+    user_groups, group_authors = group_activity()
+    user_ids = User.objects.order_by('pk').values_list('pk', flat=True)
+    written = 0
+    for chunk in chunked(
+        user_ids.iterator(),
+        chunk_size or settings.RECOMMENDATIONS_CHUNK_SIZE,
+    ):
+        rows = [
+            Recommendation(
+                user_id=user_id, author_id=author_id,
+                rank=rank, score=score,
+            )
+            for user_id in chunk
+            for rank, (author_id, score) in enumerate(
+                score_user(user_id, graph, user_groups, group_authors), 1)
+        ]
+        with transaction.atomic():
+            Recommendation.objects.filter(user_id__in=chunk).delete()
+            Recommendation.objects.bulk_create(rows)
+        cache.delete_many([CACHE_KEY.format(user_id) for user_id in chunk])
+        written += len(rows)
+    return written
+
+
+def get_recommendations(user):
+    if not user.is_authenticated:
+        return []
+    key = CACHE_KEY.format(user.pk)
+    recommendations = cache.get(key)
+    if recommendations is None:
+        recommendations = list(
+            user.recommendations.select_related('author'))
+        cache.set(key, recommendations, settings.RECOMMENDATIONS_CACHE_TIMEOUT)
+    return recommendations
@@ -0,0 +1,65 @@
+from django.db import transaction
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_delete,
+)
+from django.dispatch import receiver
+
+from core.tasks import defer
+
+from . import archive, groups
+from .events import publish_post
+from . import lookups  # noqa: F401
+from .models import Comment, Group, Post
+from .notifications import notify_followers, post_removed
+from .tags import index_posts
+from .trending import comment_added, post_published
+
+
+@receiver(post_init, sender=Post)
+def remember_saved(sender, instance, **kwargs):
+    instance._saved_group_id = instance.__dict__.get('group_id')
+    instance._saved_text = instance.__dict__.get('text')
+
+
+@receiver(post_save, sender=Post)
+def post_created(sender, instance, created, **kwargs):
+    if created or instance.group_id != instance._saved_group_id:
+        if created:
+            groups.post_added(instance.group_id, instance.pub_date)
+            archive.post_added(instance)
+        else:
+            groups.post_removed(instance._saved_group_id, instance.pub_date)
+            groups.post_added(
+                instance.group_id, instance.pub_date, newest=False)
+            archive.group_changed(instance, instance._saved_group_id)
+        instance._saved_group_id = instance.group_id
+    if created or instance.text != instance._saved_text:
+        index_posts([instance])
+        instance._saved_text = instance.text
+    if created:
+        defer(notify_followers, instance.pk)
+        defer(post_published, instance)
+        transaction.on_commit(lambda: publish_post(instance))
+
+
+@receiver(post_save, sender=Comment)
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        defer(comment_added, instance)
+
+
+@receiver(pre_delete, sender=Post)
+def post_deleting(sender, instance, **kwargs):
+    post_removed(instance.pk)
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    groups.post_removed(instance.group_id, instance.pub_date)
+    archive.post_removed(instance)
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def group_changed(sender, **kwargs):
+    groups.invalidate()
@@ -0,0 +1,74 @@
+from django.conf import settings
+from django.db.models import QuerySet
+from django.http import StreamingHttpResponse
+from django.shortcuts import render
+from django.template import Context
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+STREAM_MARKER = '<!-- stream -->'
+
+
+def render_items(template, context, items, item_name, separator):
+    """Рендерит элементы пачками по STREAM_CHUNK_SIZE."""
+    chunk = []
+    for number, item in enumerate(items):
+        if number and separator:
+            chunk.append(separator)
+        with context.push(**{item_name: item}):
+            chunk.append(template.render(context))
+        if len(chunk) >= settings.STREAM_CHUNK_SIZE:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
+
+
+def render_stream(request, template_name, context, items, item_template,
+                  item_name, separator='', **extra):
+    """
+    Страница отдается частями: сначала все до STREAM_MARKER (head с CSS,
+    шапка), затем элементы items из iterator(), затем остаток страницы.
+    """
+    shell = render_to_string(
+        template_name,
+        {**context, 'stream_marker': mark_safe(STREAM_MARKER)},
+        request,
+    )
+    if STREAM_MARKER not in shell:
+        return StreamingHttpResponse(iter((shell,)))
+    head, tail = shell.split(STREAM_MARKER, 1)
+    template = get_template(item_template).template
+    item_context = Context({
+        **context, **extra, 'request': request, 'user': request.user,
+    })
+
+    if isinstance(items, QuerySet):
+        items = items.iterator(chunk_size=settings.STREAM_CHUNK_SIZE)
+
+    def content():
+        yield head
+        yield from render_items(
+            template, item_context, items, item_name, separator)
+        yield tail
+
+    return StreamingHttpResponse(content())
+
+
+def render_page(request, template_name, context, **stream):
+    if not settings.STREAMING_RESPONSES:
+        return render(request, template_name, context)
+    return render_stream(request, template_name, context, **stream)
+
+
+def render_feed(request, template_name, context, items=None, **extra):
+    if items is None:
+        items = context['page_obj'].object_list
+    return render_page(
+        request, template_name, context,
+        items=items,
+        item_template='posts/includes/post_card.html',
+        item_name='post',
+        separator='<hr>',
+        **extra,
+    )
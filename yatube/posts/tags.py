@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.db import transaction
+
+from .models import Mention, Post, PostTag, Tag, User
+from .text import extract
+
+
+def index_posts(posts):
+    """Пересобирает строки хештегов и упоминаний для пачки постов."""
+    extracted = {post.pk: (post, *extract(post.text)) for post in posts}
+    names = set().union(*(tags for _, tags, _ in extracted.values()))
+    usernames = set().union(
+        *(mentions for _, _, mentions in extracted.values()))
+    with transaction.atomic():
+        Tag.objects.bulk_create(
+            (Tag(name=name) for name in names), ignore_conflicts=True)
+        tag_ids = dict(
+            Tag.objects.filter(name__in=names).values_list('name', 'pk'))
+        user_ids = dict(User.objects.filter(
+            username__in=usernames).values_list('username', 'pk'))
+        PostTag.objects.filter(post_id__in=extracted).delete()
+        Mention.objects.filter(post_id__in=extracted).delete()
+        PostTag.objects.bulk_create(
+            PostTag(post_id=pk, tag_id=tag_ids[name], pub_date=post.pub_date)
+            for pk, (post, tags, _) in extracted.items() for name in tags
+        )
+        Mention.objects.bulk_create(
+            Mention(post_id=pk, user_id=user_ids[username],
+                    pub_date=post.pub_date)
+            for pk, (post, _, mentions) in extracted.items()
+            for username in mentions if username in user_ids
+        )
+
+
+def backfill(chunk_size=None):
+    """Индексирует все посты пачками по pk, не держа их в памяти."""
+    chunk_size = chunk_size or settings.TAG_INDEX_CHUNK_SIZE
+    posts = Post.objects.only('id', 'text', 'pub_date').order_by('pk')
+    indexed = 0
+    last_pk = 0
+    while True:
+        chunk = list(posts.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return indexed
+        index_posts(chunk)
+        indexed += len(chunk)
+        last_pk = chunk[-1].pk
@@ -0,0 +1,10 @@
+from django import template
+
+from posts.urlbuilders import post_url as build_post_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_url(name, *args):
+    return build_post_url(name, *args)
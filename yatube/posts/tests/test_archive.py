@@ -0,0 +1,113 @@
+from datetime import datetime
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from posts.archive import (
+    INDEX, author_scope, get_months, group_scope, month_of, rebuild,
+)
+from posts.models import ArchiveBucket, Group, Post, User
+
+
+class ArchiveTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Chronicler')
+        cls.group = Group.objects.create(title='Летопись', slug='annals')
+        cls.other_group = Group.objects.create(title='Другая', slug='other')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def create_post(self, group=None):
+        return Post.objects.create(
+            text='Пост', author=self.user, group=group)
+
+    def counts(self):
+        return dict(ArchiveBucket.objects.values_list('scope', 'count'))
+
+    def move_to(self, post, year, month):
+        Post.objects.filter(pk=post.pk).update(
+            pub_date=timezone.make_aware(datetime(year, month, 15)))
+
+    def test_counters_follow_posts(self):
+        """Счетчики меняются при создании, переносе и удалении поста."""
+        post = self.create_post(self.group)
+        self.create_post()
+        self.assertEqual(self.counts(), {
+            INDEX: 2,
+            author_scope(self.user.pk): 2,
+            group_scope(self.group.pk): 1,
+        })
+        post.group = self.other_group
+        post.save()
+        self.assertEqual(self.counts()[group_scope(self.group.pk)], 0)
+        self.assertEqual(self.counts()[group_scope(self.other_group.pk)], 1)
+        post.delete()
+        self.assertEqual(self.counts()[INDEX], 1)
+        self.assertEqual(get_months(group_scope(self.other_group.pk)), [])
+
+    def test_rebuild_matches_incremental(self):
+        """Пересчет с нуля совпадает с инкрементальными счетчиками."""
+        for group in (self.group, None, self.group):
+            self.create_post(group)
+        incremental = self.counts()
+        self.assertEqual(rebuild(), len(incremental))
+        self.assertEqual(self.counts(), incremental)
+
+    def test_archive_pages(self):
+        """Архив показывает посты только выбранного месяца."""
+        old = self.create_post(self.group)
+        self.move_to(old, 2021, 3)
+        self.create_post(self.group)
+        call_command('rebuild_archive', stdout=StringIO())
+        urls = (
+            reverse('posts:archive', args=(2021, 3)),
+            reverse('posts:group_archive', args=(self.group.slug, 2021, 3)),
+            reverse(
+                'posts:profile_archive', args=(self.user.username, 2021, 3)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                page_obj = response.context['page_obj']
+                self.assertEqual(list(page_obj), [old])
+                self.assertEqual(page_obj.paginator.count, 1)
+                months = [
+                    (bucket['month'].year, bucket['month'].month)
+                    for bucket in response.context['archive']
+                ]
+                self.assertEqual(
+                    months, [month_of(timezone.now()), (2021, 3)])
+
+    def test_invalid_month(self):
+        """Несуществующий месяц отдает 404."""
+        response = self.client.get(
+            reverse('posts:archive', args=(2021, 13)))
+        self.assertEqual(response.status_code, 404)
+
+    def test_sidebar_without_group_by(self):
+        """Боковая панель архива не группирует таблицу постов."""
+        self.create_post(self.group)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('posts:index'))
+        self.assertEqual(len(response.context['archive']), 1)
+        self.assertFalse(any(
+            'GROUP BY' in query['sql'] for query in queries))
+
+    @override_settings(STREAMING_RESPONSES=True)
+    def test_sidebar_on_streamed_index(self):
+        """Главная в потоковом режиме тоже показывает архив."""
+        self.create_post()
+        response = self.client.get(reverse('posts:index'))
+        content = b''.join(response.streaming_content).decode()
+        self.assertIn(reverse('posts:archive', args=month_of(
+            timezone.now())), content)
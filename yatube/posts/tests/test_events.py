@@ -0,0 +1,83 @@
+import json
+import threading
+
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.events import Broker
+from posts.models import Group, Post, User
+
+
+def get_events(client, data):
+    return client.get(
+        reverse('posts:feed_events'), data,
+        HTTP_ACCEPT='text/event-stream',
+    )
+
+
+def read_events(response):
+    content = b''.join(response.streaming_content).decode()
+    return [
+        json.loads(line[len('data: '):])
+        for line in content.splitlines() if line.startswith('data: ')
+    ]
+
+
+@override_settings(FEED_EVENTS_DURATION=0, FEED_EVENTS_STREAM=True)
+class FeedEventsTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Live')
+        cls.group = Group.objects.create(title='Группа', slug='live')
+        cls.old_post = Post.objects.create(text='Старый', author=cls.user)
+
+    def setUp(self):
+        self.client = Client()
+
+    def test_broker_wakes_waiting_client(self):
+        """Подписчик брокера просыпается при публикации поста."""
+        broker = Broker()
+        timer = threading.Timer(0.05, broker.publish, (['index'], 42))
+        timer.start()
+        self.assertEqual(broker.wait(['index'], 0, timeout=5), 42)
+        self.assertEqual(broker.wait(['group:1'], 0, timeout=0), 0)
+
+    def test_stream_reports_new_posts(self):
+        """Поток сообщает количество постов новее since."""
+        Post.objects.create(text='Новый', author=self.user)
+        Post.objects.create(text='Новый в группе', author=self.user,
+                            group=self.group)
+        response = get_events(self.client, {'since': self.old_post.id})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(read_events(response)[0]['count'], 2)
+        response = get_events(self.client, {
+            'feed': 'group', 'slug': self.group.slug,
+            'since': self.old_post.id,
+        })
+        self.assertEqual(read_events(response)[0]['count'], 1)
+
+    def test_stream_without_new_posts(self):
+        """Без новых постов событий нет."""
+        response = get_events(self.client, {'since': self.old_post.id})
+        self.assertEqual(read_events(response), [])
+
+    @override_settings(FEED_EVENTS_STREAM=False)
+    def test_poll_snapshot(self):
+        """Без потока SSE лента отвечает коротким JSON для опроса."""
+        new_post = Post.objects.create(text='Новый', author=self.user)
+        response = get_events(self.client, {'since': self.old_post.id})
+        self.assertEqual(response['Content-Type'], 'application/json')
+        data = response.json()
+        self.assertEqual((data['count'], data['latest']), (1, new_post.id))
+        response = self.client.get(
+            reverse('posts:feed_events'), {'since': new_post.id})
+        self.assertEqual(response.json()['count'], 0)
+
+    def test_index_since_returns_delta(self):
+        """Лента с параметром since содержит только новые посты."""
+        new_post = Post.objects.create(text='Новый', author=self.user)
+        response = self.client.get(
+            reverse('posts:index'), {'since': self.old_post.id}
+        )
+        self.assertEqual(list(response.context['page_obj']), [new_post])
@@ -0,0 +1,60 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+LONG_TEXT = 'слово ' * 200
+
+
+class ExcerptTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Writer')
+        cls.group = Group.objects.create(title='Группа', slug='excerpt')
+        cls.post = Post.objects.create(
+            text=LONG_TEXT, author=cls.user, group=cls.group)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_excerpt_generated(self):
+        """Начало текста заполняется при save() и bulk_create()."""
+        field = Post._meta.get_field('excerpt')
+        self.assertEqual(self.post.excerpt, field.make_excerpt(LONG_TEXT))
+        self.assertLessEqual(len(self.post.excerpt), field.length)
+        Post.objects.bulk_create([Post(text='Коротко', author=self.user)])
+        self.assertEqual(
+            Post.objects.get(text='Коротко').excerpt, 'Коротко')
+
+    @override_settings(STREAMING_RESPONSES=False)
+    def test_feeds_skip_text_and_password(self):
+        """Ленты не читают полный текст поста и хеш пароля автора."""
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                with CaptureQueriesContext(connection) as queries:
+                    response = self.client.get(url)
+                posts_sql = [
+                    query['sql'] for query in queries
+                    if 'FROM "posts_post"' in query['sql']
+                    and '"posts_post"."excerpt_html"' in query['sql']
+                ]
+                self.assertTrue(posts_sql)
+                for sql in posts_sql:
+                    self.assertNotIn('"posts_post"."text"', sql)
+                    self.assertNotIn('"auth_user"."password"', sql)
+                self.assertNotContains(response, LONG_TEXT.strip())
+                self.assertContains(response, self.post.get_absolute_url())
+
+    def test_detail_shows_full_text(self):
+        """Полный текст остается на странице поста."""
+        response = Client().get(self.post.get_absolute_url())
+        self.assertContains(response, LONG_TEXT.strip())
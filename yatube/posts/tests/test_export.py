@@ -0,0 +1,93 @@
+import json
+import zipfile
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Group, Post, User
+
+SMALL_GIF = (
+    b'\x47\x49\x46\x38\x39\x61\x02\x00'
+    b'\x01\x00\x80\x00\x00\x00\x00\x00'
+    b'\xFF\xFF\xFF\x21\xF9\x04\x00\x00'
+    b'\x00\x00\x00\x2C\x00\x00\x00\x00'
+    b'\x02\x00\x01\x00\x00\x02\x02\x0C'
+    b'\x0A\x00\x3B'
+)
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2, EXPORT_BUFFER_SIZE=64)
+class ExportTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Exporter')
+        other = User.objects.create_user(username='Stranger')
+        group = Group.objects.create(title='Группа', slug='export')
+        cls.posts = [
+            Post.objects.create(
+                text=f'Пост {number}', author=cls.user, group=group)
+            for number in range(3)
+        ]
+        cls.image_post = Post.objects.create(
+            text='С картинкой',
+            author=cls.user,
+            image=SimpleUploadedFile(
+                name='export.gif', content=SMALL_GIF,
+                content_type='image/gif',
+            ),
+        )
+        foreign = Post.objects.create(text='Чужой пост', author=other)
+        cls.comment = Comment.objects.create(
+            post=foreign, author=cls.user, text='Мой комментарий')
+        Comment.objects.create(
+            post=cls.posts[0], author=other, text='Чужой комментарий')
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def download(self):
+        response = self.client.get(
+            reverse('posts:export'), HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertTrue(response.streaming)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        chunks = list(response.streaming_content)
+        self.assertGreater(len(chunks), 1)
+        return zipfile.ZipFile(BytesIO(b''.join(chunks)))
+
+    def rows(self, archive, name):
+        return [
+            json.loads(line) for line in archive.read(name).splitlines()
+        ]
+
+    def test_export_contains_own_rows(self):
+        """Архив содержит только посты и комментарии пользователя."""
+        archive = self.download()
+        posts = self.rows(archive, 'posts.ndjson')
+        self.assertEqual(
+            [post['id'] for post in posts],
+            [post.id for post in self.posts + [self.image_post]],
+        )
+        self.assertEqual(posts[0]['group'], 'export')
+        comments = self.rows(archive, 'comments.ndjson')
+        self.assertEqual(
+            [(comment['id'], comment['text']) for comment in comments],
+            [(self.comment.id, 'Мой комментарий')],
+        )
+
+    def test_export_contains_images(self):
+        """Картинки постов лежат в архиве под своими путями."""
+        archive = self.download()
+        name = self.image_post.image.name
+        self.assertEqual(self.rows(archive, 'posts.ndjson')[-1]['image'], name)
+        self.assertEqual(archive.read(name), SMALL_GIF)
+        self.assertIsNone(archive.testzip())
+
+    def test_export_requires_login(self):
+        """Гость отправляется на страницу входа."""
+        response = Client().get(reverse('posts:export'))
+        self.assertEqual(response.status_code, 302)
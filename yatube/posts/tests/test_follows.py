@@ -0,0 +1,54 @@
+from http import HTTPStatus
+
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from posts.follows import follow, unfollow
+from posts.models import Follow, User
+
+
+class FollowTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Writer')
+        cls.reader = User.objects.create_user(username='Reader')
+
+    def setUp(self):
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def test_follow_is_single_statement(self):
+        """Подписка и отписка выполняются одним запросом."""
+        with self.assertNumQueries(1):
+            self.assertTrue(follow(self.reader, self.author.username))
+        with self.assertNumQueries(1):
+            self.assertFalse(follow(self.reader, self.author.username))
+        with self.assertNumQueries(1):
+            self.assertFalse(follow(self.reader, self.reader.username))
+        self.assertEqual(Follow.objects.count(), 1)
+        with self.assertNumQueries(1):
+            self.assertTrue(unfollow(self.reader, self.author.username))
+        self.assertFalse(Follow.objects.exists())
+
+    def test_json_response(self):
+        """Асинхронный клиент получает JSON вместо редиректа."""
+        url = reverse('posts:profile_follow', args=(self.author.username,))
+        for _ in range(2):
+            response = self.client.post(url, HTTP_ACCEPT='application/json')
+            self.assertEqual(response.json(), {'following': True})
+        response = self.client.post(
+            reverse('posts:profile_unfollow', args=(self.author.username,)),
+            HTTP_ACCEPT='application/json',
+        )
+        self.assertEqual(response.json(), {'following': False})
+
+    def test_post_only(self):
+        """GET не меняет подписки, неизвестный автор дает 404."""
+        url = reverse('posts:profile_follow', args=(self.author.username,))
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, HTTPStatus.METHOD_NOT_ALLOWED)
+        self.assertFalse(Follow.objects.exists())
+        response = self.client.post(
+            reverse('posts:profile_follow', args=('nobody',)))
+        self.assertEqual(response.status_code, HTTPStatus.NOT_FOUND)
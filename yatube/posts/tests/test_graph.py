@@ -0,0 +1,98 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.follows import bulk_follow
+from posts import graph as graph_module
+from posts.graph import get_graph
+from posts.models import Follow, User
+
+
+class FollowGraphTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.users = [
+            User.objects.create_user(username=f'user{number}')
+            for number in range(5)
+        ]
+
+    def follow(self, user, *authors):
+        Follow.objects.bulk_create(
+            Follow(user=self.users[user], author=self.users[author])
+            for author in authors
+        )
+
+    @override_settings(FOLLOW_BULK_CHUNK_SIZE=2)
+    def test_bulk_follow(self):
+        """Массовая подписка идет пачками и пропускает повторы."""
+        self.follow(0, 1)
+        usernames = [user.username for user in self.users] + ['nobody']
+        with self.assertNumQueries(6):
+            missing = bulk_follow(self.users[0], usernames)
+        self.assertEqual(missing, ['nobody'])
+        self.assertEqual(
+            set(self.users[0].follower.values_list('author_id', flat=True)),
+            {user.pk for user in self.users[1:]},
+        )
+
+    def test_mutual_and_suggestions(self):
+        """Граф находит взаимные подписки и авторов друзей."""
+        self.follow(0, 1, 2)
+        self.follow(1, 0, 3, 4)
+        self.follow(2, 3)
+        graph = get_graph(refresh=True)
+        first, second, third, fourth = (user.pk for user in self.users[1:])
+        self.assertEqual(graph.mutual(self.users[0].pk), [first])
+        self.assertEqual(
+            graph.suggestions(self.users[0].pk), [(third, 2), (fourth, 1)])
+        self.assertEqual(graph.suggestions(fourth), [])
+
+    def test_graph_refreshed_by_ttl(self):
+        """Граф перестраивается после FOLLOW_GRAPH_TTL."""
+        graph = get_graph(refresh=True)
+        self.assertIs(get_graph(), graph)
+        with override_settings(FOLLOW_GRAPH_TTL=-1):
+            self.assertIsNot(get_graph(), graph)
+
+    def test_stale_graph_served_while_refreshing(self):
+        """Пока граф перестраивается, запросы получают старый без ожидания."""
+        graph = get_graph(refresh=True)
+        graph_module.refreshing = True
+        try:
+            with override_settings(FOLLOW_GRAPH_TTL=-1):
+                with self.assertNumQueries(0):
+                    self.assertIs(get_graph(), graph)
+        finally:
+            graph_module.refreshing = False
+
+    def test_api(self):
+        """API массовой подписки и рекомендаций."""
+        client = Client()
+        client.force_login(self.users[0])
+        response = client.post(
+            reverse('api:bulk_follow'),
+            json.dumps({'usernames': ['user1', 'user2', 'ghost']}),
+            content_type='application/json',
+        )
+        self.assertEqual(response.json(), {'missing': ['ghost']})
+        self.follow(1, 3)
+        get_graph(refresh=True)
+        response = client.get(reverse('api:follow_suggestions'))
+        self.assertEqual(response.json()['results'], [
+            {'username': 'user3', 'full_name': '', 'followed_by': 1},
+        ])
+        response = client.post(
+            reverse('api:bulk_follow'), '[]',
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_command(self):
+        """Команда bulk_follow подписывает на перечисленных авторов."""
+        call_command(
+            'bulk_follow', 'user0', 'user1', 'user2', stdout=StringIO())
+        self.assertEqual(self.users[0].follower.count(), 2)
@@ -0,0 +1,122 @@
+import base64
+import json
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+
+
+@override_settings(GROUPS_PER_PAGE=2)
+class GroupDirectoryTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Writer')
+        cls.groups = [
+            Group.objects.create(title=f'Группа {number}', slug=f'g{number}')
+            for number in range(5)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def create_post(self, group):
+        return Post.objects.create(text='Пост', author=self.user, group=group)
+
+    def test_counters_follow_posts(self):
+        """Счетчики групп меняются при создании, переносе и удалении."""
+        first, second = self.groups[:2]
+        post = self.create_post(first)
+        self.create_post(first)
+        first.refresh_from_db()
+        self.assertEqual(first.post_count, 2)
+        self.assertIsNotNone(first.last_post_at)
+        post.group = second
+        post.save()
+        post.delete()
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.post_count, second.post_count), (1, 0))
+        self.assertIsNone(second.last_post_at)
+
+    def test_counters_without_recount(self):
+        """Счетчики меняются без пересчета постов группы."""
+        group = self.groups[0]
+        older = self.create_post(group)
+        with CaptureQueriesContext(connection) as queries:
+            newest = self.create_post(group)
+            newest.delete()
+        self.assertFalse(any(
+            'COUNT(' in query['sql'] for query in queries))
+        group.refresh_from_db()
+        self.assertEqual(group.post_count, 1)
+        self.assertEqual(group.last_post_at, older.pub_date)
+
+    def test_group_save_keeps_counters(self):
+        """Сохранение группы не затирает счетчики устаревшими значениями."""
+        group = self.groups[0]
+        self.create_post(group)
+        group.title = 'Новое название'
+        group.save()
+        group.refresh_from_db()
+        self.assertEqual(group.post_count, 1)
+        self.assertIsNotNone(group.last_post_at)
+
+    def test_recount_command(self):
+        """Команда восстанавливает счетчики с нуля."""
+        group = self.groups[0]
+        self.create_post(group)
+        Group.objects.update(post_count=7, last_post_at=None)
+        call_command('recount_groups', stdout=StringIO())
+        group.refresh_from_db()
+        self.assertEqual(group.post_count, 1)
+        self.assertIsNotNone(group.last_post_at)
+
+    def test_malformed_cursor(self):
+        """Курсор с неверным типом значения не ломает каталог."""
+        for value in ('x', [1], 1.5):
+            cursor = base64.urlsafe_b64encode(
+                json.dumps([value, 1]).encode()).decode()
+            for sort in ('posts', 'activity'):
+                with self.subTest(value=value, sort=sort):
+                    response = self.client.get(
+                        reverse('posts:group_index'),
+                        {'sort': sort, 'cursor': cursor},
+                    )
+                    self.assertEqual(response.status_code, 200)
+
+    def walk(self, sort):
+        seen, cursor = [], None
+        while True:
+            params = {'sort': sort}
+            if cursor:
+                params['cursor'] = cursor
+            response = self.client.get(reverse('posts:group_index'), params)
+            seen.extend(group.slug for group in response.context['groups'])
+            cursor = response.context['next_cursor']
+            if cursor is None:
+                return seen
+
+    def test_cursor_pagination(self):
+        """Курсор проходит все группы в порядке активности."""
+        for slug in ('g1', 'g3', 'g3', 'g0'):
+            self.create_post(Group.objects.get(slug=slug))
+        self.assertEqual(self.walk('activity'), ['g0', 'g3', 'g1', 'g4', 'g2'])
+        self.assertEqual(self.walk('posts'), ['g3', 'g1', 'g0', 'g4', 'g2'])
+
+    def test_cached_until_post_saved(self):
+        """Страница каталога кэшируется и сбрасывается новым постом."""
+        url = reverse('posts:group_index')
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            self.client.get(url)
+        self.create_post(self.groups[2])
+        response = self.client.get(url)
+        self.assertEqual(response.context['groups'][0], self.groups[2])
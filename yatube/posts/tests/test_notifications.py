@@ -0,0 +1,104 @@
+from django.core.cache import cache
+from django.test import (
+    Client, TestCase, TransactionTestCase, override_settings,
+)
+from django.urls import reverse
+
+from posts.models import Follow, Notification, Post, User
+from posts.notifications import notify_followers, unread_count
+
+
+class NotificationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Author')
+        cls.followers = [
+            User.objects.create_user(username=f'Follower{number}')
+            for number in range(3)
+        ]
+        Follow.objects.bulk_create(
+            Follow(user=follower, author=cls.author)
+            for follower in cls.followers
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.followers[0])
+
+    def create_post(self):
+        return Post.objects.create(text='Новый пост', author=self.author)
+
+    @override_settings(NOTIFICATION_CHUNK_SIZE=2)
+    def test_followers_notified(self):
+        """Каждый подписчик получает уведомление о новом посте."""
+        notify_followers(self.create_post().id)
+        self.assertEqual(Notification.objects.count(), len(self.followers))
+        for follower in self.followers:
+            with self.subTest(follower=follower):
+                self.assertEqual(unread_count(follower), 1)
+
+    @override_settings(NOTIFICATION_DIGEST=True)
+    def test_digest_coalesces_posts(self):
+        """Непрочитанные посты автора собираются в одно уведомление."""
+        for _ in range(3):
+            notify_followers(self.create_post().id)
+        notification = self.followers[0].notifications.get()
+        self.assertEqual(notification.posts_count, 3)
+        self.assertEqual(unread_count(self.followers[0]), 1)
+
+    @override_settings(NOTIFICATION_DIGEST=False)
+    def test_without_digest(self):
+        """Без дайджеста каждый пост дает отдельное уведомление."""
+        for _ in range(2):
+            notify_followers(self.create_post().id)
+        self.assertEqual(self.followers[0].notifications.count(), 2)
+        self.assertEqual(unread_count(self.followers[0]), 2)
+
+    def test_badge_read_from_cache(self):
+        """Счетчик в шапке берется из кэша без запроса к базе."""
+        notify_followers(self.create_post().id)
+        unread_count(self.followers[0])
+        with self.assertNumQueries(0):
+            self.assertEqual(unread_count(self.followers[0]), 1)
+
+    def test_notifications_page_marks_read(self):
+        """Страница уведомлений помечает их прочитанными."""
+        notify_followers(self.create_post().id)
+        response = self.client.get(reverse('posts:notifications'))
+        self.assertEqual(len(response.context['page_obj']), 1)
+        self.assertEqual(unread_count(self.followers[0]), 0)
+        self.assertFalse(
+            self.followers[0].notifications.filter(is_read=False).exists()
+        )
+
+    @override_settings(NOTIFICATION_DIGEST=False, POST_PER_PAGE=1)
+    def test_only_shown_page_marked_read(self):
+        """Прочитанными становятся только уведомления показанной страницы."""
+        for _ in range(2):
+            notify_followers(self.create_post().id)
+        self.client.get(reverse('posts:notifications'))
+        self.assertEqual(unread_count(self.followers[0]), 1)
+        self.assertEqual(
+            self.followers[0].notifications.filter(is_read=False).count(), 1)
+
+    def test_deleted_post_leaves_counter(self):
+        """Удаление поста уменьшает счетчик непрочитанных."""
+        post = self.create_post()
+        notify_followers(post.id)
+        self.assertEqual(unread_count(self.followers[0]), 1)
+        post.delete()
+        self.assertEqual(unread_count(self.followers[0]), 0)
+
+
+class NotificationSignalTests(TransactionTestCase):
+    def test_new_post_notifies_followers(self):
+        """Новый пост рассылает уведомления через defer после коммита."""
+        author = User.objects.create_user(username='Author')
+        follower = User.objects.create_user(username='Follower')
+        Follow.objects.create(user=follower, author=author)
+        cache.clear()
+        post = Post.objects.create(text='Новый пост', author=author)
+        self.assertEqual(follower.notifications.get().post, post)
+        self.assertEqual(unread_count(follower), 1)
@@ -0,0 +1,50 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import Follow, Group, Post, User
+
+AMOUNT_POSTS = 13
+
+
+class ProfileQueriesTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Prolific')
+        cls.reader = User.objects.create_user(username='Viewer')
+        group = Group.objects.create(title='Группа', slug='profile')
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=cls.author, group=group)
+            for number in range(AMOUNT_POSTS)
+        )
+        Follow.objects.create(user=cls.reader, author=cls.author)
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.reader)
+
+    def test_two_queries(self):
+        """Профиль для авторизованного читателя стоит два запроса."""
+        url = reverse('posts:profile', args=(self.author.username,))
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(len(queries), 2, [q['sql'] for q in queries])
+        author = response.context['author']
+        self.assertEqual(author.posts_count, AMOUNT_POSTS)
+        self.assertEqual(author.following_count, 1)
+        self.assertEqual(author.follower_count, 0)
+        self.assertTrue(response.context['following'])
+        self.assertEqual(
+            response.context['page_obj'].paginator.num_pages, 2)
+
+    def test_anonymous_not_following(self):
+        """Гость видит профиль без подписки."""
+        response = Client().get(
+            reverse('posts:profile', args=(self.author.username,)))
+        self.assertFalse(response.context['following'])
+        self.assertContains(response, f'Всего постов: {AMOUNT_POSTS}')
@@ -0,0 +1,76 @@
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Follow, Group, Post, Recommendation, User
+from posts.recommendations import build_recommendations, get_recommendations
+
+
+@override_settings(RECOMMENDATIONS_TOP_K=5, RECOMMENDATIONS_GROUP_WEIGHT=0.5)
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.users = [
+            User.objects.create_user(username=f'reader{number}')
+            for number in range(5)
+        ]
+        reader, author, friend, cofollowed, neighbour = cls.users
+        Follow.objects.bulk_create([
+            Follow(user=reader, author=author),
+            Follow(user=friend, author=author),
+            Follow(user=friend, author=cofollowed),
+        ])
+        group = Group.objects.create(title='Группа', slug='recs')
+        Post.objects.create(text='Пост', author=reader, group=group)
+        Post.objects.create(text='Пост', author=neighbour, group=group)
+
+    def test_build(self):
+        """Рекомендации учитывают совместные подписки и группы."""
+        build_recommendations(chunk_size=2)
+        reader, _, _, cofollowed, neighbour = self.users
+        self.assertEqual(
+            list(reader.recommendations.values_list('author', 'score')),
+            [(cofollowed.pk, 1.0), (neighbour.pk, 0.5)],
+        )
+        build_recommendations()
+        self.assertEqual(reader.recommendations.count(), 2)
+
+    def test_walk_is_capped(self):
+        """Обход ограничен числом читателей автора, подписок читателя
+        и авторов группы."""
+        reader, _, _, cofollowed, neighbour = self.users
+        with self.settings(RECOMMENDATIONS_AUTHORS_PER_READER=1):
+            build_recommendations()
+        self.assertEqual(
+            list(reader.recommendations.values_list('author', flat=True)),
+            [neighbour.pk],
+        )
+        with self.settings(RECOMMENDATIONS_READERS_PER_AUTHOR=1):
+            build_recommendations()
+        self.assertEqual(
+            list(reader.recommendations.values_list('author', flat=True)),
+            [cofollowed.pk, neighbour.pk],
+        )
+        with self.settings(RECOMMENDATIONS_AUTHORS_PER_GROUP=1):
+            build_recommendations()
+        self.assertEqual(
+            list(reader.recommendations.values_list('author', flat=True)),
+            [cofollowed.pk],
+        )
+
+    def test_served_with_single_query(self):
+        """Рекомендации читаются одним запросом и видны в ленте подписок."""
+        build_recommendations()
+        reader = self.users[0]
+        with self.assertNumQueries(1):
+            authors = [
+                recommendation.author.username
+                for recommendation in get_recommendations(reader)
+            ]
+        self.assertEqual(authors, ['reader3', 'reader4'])
+        client = Client()
+        client.force_login(reader)
+        response = client.get(reverse('posts:follow_index'))
+        self.assertContains(response, 'Кого почитать')
+        self.assertFalse(Recommendation.objects.filter(
+            user=self.users[3]).exists())
@@ -0,0 +1,68 @@
+from django.core.cache import cache
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Comment, Group, Post, User
+
+AMOUNT_COMMENTS = 5
+
+
+@override_settings(STREAMING_RESPONSES=True, STREAM_CHUNK_SIZE=2)
+class StreamingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Stream')
+        cls.group = Group.objects.create(title='Группа', slug='stream')
+        cls.post = Post.objects.create(
+            text='Потоковый пост', author=cls.user, group=cls.group,
+        )
+        Comment.objects.bulk_create(
+            Comment(post=cls.post, author=cls.user, text=f'Коммент {number}')
+            for number in range(AMOUNT_COMMENTS)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def test_post_detail_streams_comments(self):
+        """Комментарии отдаются пачками после шапки страницы."""
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.post.id,)))
+        self.assertTrue(response.streaming)
+        self.assertEqual(response.context['post'], self.post)
+        chunks = [chunk.decode() for chunk in response.streaming_content]
+        self.assertIn('bootstrap.min.css', chunks[0])
+        self.assertNotIn('Коммент', chunks[0])
+        self.assertEqual(len(chunks), 2 + (AMOUNT_COMMENTS + 1) // 2)
+        html = ''.join(chunks)
+        for number in range(AMOUNT_COMMENTS):
+            self.assertIn(f'Коммент {number}', html)
+        self.assertTrue(html.rstrip().endswith('</html>'))
+
+    def test_feeds_stream_post_cards(self):
+        """Ленты отдают карточки постов потоком."""
+        Post.objects.create(text='Второй пост', author=self.user,
+                            group=self.group)
+        urls = (
+            reverse('posts:index'),
+            reverse('posts:group_list', args=(self.group.slug,)),
+            reverse('posts:profile', args=(self.user.username,)),
+        )
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                html = b''.join(response.streaming_content).decode()
+                self.assertIn('Потоковый пост', html)
+                self.assertIn('Второй пост', html)
+                self.assertNotIn('<!-- stream -->', html)
+
+    @override_settings(STREAMING_RESPONSES=False)
+    def test_streaming_disabled(self):
+        """Без STREAMING_RESPONSES страница рендерится целиком."""
+        response = self.client.get(
+            reverse('posts:post_detail', args=(self.post.id,)))
+        self.assertFalse(response.streaming)
+        self.assertContains(response, 'Коммент 0')
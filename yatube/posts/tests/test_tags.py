@@ -0,0 +1,76 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Mention, Post, PostTag, Tag, User
+from posts.text import extract, render
+
+
+class TagIndexTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Author')
+        cls.reader = User.objects.create_user(username='Reader')
+
+    def test_extract(self):
+        """Хештеги и упоминания ищутся вне ссылок и кода."""
+        self.assertEqual(
+            extract('#Django и @Reader, https://x.ru/#frag `#code` a#b'),
+            ({'django'}, {'Reader'}),
+        )
+        self.assertEqual(
+            render('#Django'), '<p><a href="/tag/django/">#Django</a></p>')
+
+    def test_indexed_on_save(self):
+        """Индекс обновляется при создании и правке поста."""
+        post = Post.objects.create(
+            text='#Python для @Reader и @ghost', author=self.author)
+        self.assertEqual(list(post.tags.values_list('name', flat=True)),
+                         ['python'])
+        self.assertEqual(list(post.mentioned.all()), [self.reader])
+        post.text = '#django'
+        post.save()
+        self.assertEqual(list(post.tags.values_list('name', flat=True)),
+                         ['django'])
+        self.assertFalse(Mention.objects.exists())
+
+    @override_settings(POST_PER_PAGE=2)
+    def test_tag_feed_cursor(self):
+        """Лента хештега проходится курсором от новых к старым."""
+        posts = [
+            Post.objects.create(text=f'#тег {number}', author=self.author)
+            for number in range(5)
+        ]
+        Post.objects.create(text='без тега', author=self.author)
+        seen, params = [], {}
+        url = reverse('posts:tag_posts', args=('ТЕГ',))
+        while True:
+            response = self.client.get(url, params)
+            seen.extend(response.context['posts'])
+            if response.context['next_cursor'] is None:
+                break
+            params['cursor'] = response.context['next_cursor']
+        self.assertEqual(seen, posts[::-1])
+
+    def test_mentions_feed(self):
+        """Лента упоминаний показывает посты с @username читателя."""
+        post = Post.objects.create(text='Привет, @Reader', author=self.author)
+        Post.objects.create(text='Привет всем', author=self.author)
+        client = Client()
+        client.force_login(self.reader)
+        response = client.get(reverse('posts:mentions'))
+        self.assertEqual(response.context['posts'], [post])
+
+    def test_backfill(self):
+        """Команда индексирует посты, созданные в обход save()."""
+        Post.objects.bulk_create(
+            Post(text=f'#old{number % 2} @Reader', author=self.author)
+            for number in range(5)
+        )
+        call_command('index_tags', '--chunk-size', '2', stdout=StringIO())
+        self.assertEqual(Tag.objects.count(), 2)
+        self.assertEqual(PostTag.objects.count(), 5)
+        self.assertEqual(self.reader.mentions.count(), 5)
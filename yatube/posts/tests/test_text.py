@@ -0,0 +1,67 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from posts import text
+from posts.models import Post, User
+
+
+class RenderTests(TestCase):
+    def test_markup(self):
+        """Разметка поста и экранирование HTML."""
+        cases = (
+            ('<script>alert(1)</script>',
+             '<p>&lt;script&gt;alert(1)&lt;/script&gt;</p>'),
+            ('**жирный** и *курсив*',
+             '<p><strong>жирный</strong> и <em>курсив</em></p>'),
+            ('`<b>` и 2*3*4', '<p><code>&lt;b&gt;</code> и 2*3*4</p>'),
+            ('первая\nвторая\n\nабзац',
+             '<p>первая<br>вторая</p>\n\n<p>абзац</p>'),
+            ('см. https://ya.ru/?a=1&b=2.',
+             '<p>см. <a href="https://ya.ru/?a=1&amp;b=2" '
+             'rel="nofollow noopener">https://ya.ru/?a=1&amp;b=2</a>.</p>'),
+            ('привет, @leo_tolstoy!',
+             '<p>привет, <a href="/profile/leo_tolstoy/">'
+             '@leo_tolstoy</a>!</p>'),
+            ('mail@example.com', '<p>mail@example.com</p>'),
+        )
+        for source, expected in cases:
+            with self.subTest(source=source):
+                self.assertEqual(text.render(source), expected)
+
+
+class StoredHtmlTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Writer')
+
+    def test_rendered_on_save(self):
+        """HTML и версия разметки сохраняются вместе с постом."""
+        post = Post.objects.create(text='**Жирный**', author=self.user)
+        post.refresh_from_db()
+        self.assertEqual(post.text_html, '<p><strong>Жирный</strong></p>')
+        self.assertEqual(post.excerpt_html, post.text_html)
+        self.assertEqual(post.text_version, text.VERSION)
+        response = self.client.get(post.get_absolute_url())
+        self.assertContains(response, post.text_html, html=True)
+
+    def test_rerender_stale(self):
+        """Команда перерисовывает только посты со старой версией."""
+        Post.objects.bulk_create(
+            Post(text=f'*Пост {number}*', author=self.user)
+            for number in range(5)
+        )
+        Post.objects.filter(text='*Пост 0*').update(
+            text_html='', text_version=0)
+        out = StringIO()
+        call_command('rerender_posts', '--chunk-size', '2', stdout=out)
+        self.assertIn('Перерисовано постов: 1', out.getvalue())
+        self.assertEqual(
+            Post.objects.get(text='*Пост 0*').text_html,
+            '<p><em>Пост 0</em></p>',
+        )
+        call_command('rerender_posts', '--all', stdout=out)
+        self.assertFalse(
+            Post.objects.exclude(text_version=text.VERSION).exists())
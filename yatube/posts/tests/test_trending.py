@@ -0,0 +1,96 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from posts import trending
+from posts.models import (
+    Comment, Follow, Group, GroupScore, Post, PostScore, User,
+)
+
+
+class TrendingTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.author = User.objects.create_user(username='Star')
+        cls.reader = User.objects.create_user(username='Fan')
+        cls.group = Group.objects.create(title='Горячее', slug='hot')
+        cls.quiet_group = Group.objects.create(title='Тихое', slug='quiet')
+        cls.old = Post.objects.create(
+            text='Старый', author=cls.author, group=cls.group)
+        Post.objects.filter(pk=cls.old.pk).update(
+            pub_date=timezone.now() - timedelta(days=2))
+        cls.old.refresh_from_db()
+        cls.fresh = Post.objects.create(
+            text='Свежий', author=cls.author, group=cls.quiet_group)
+
+    def setUp(self):
+        cache.clear()
+
+    def publish(self):
+        for post in (self.old, self.fresh):
+            trending.post_published(post)
+
+    def test_decay_and_engagement(self):
+        """Свежий пост выше старого, пока старый не наберет активность."""
+        self.publish()
+        self.assertEqual(
+            trending.trending_post_ids(), [self.fresh.pk, self.old.pk])
+        for _ in range(3):
+            comment = Comment.objects.create(
+                text='Ого', author=self.reader, post=self.old)
+            trending.comment_added(comment)
+        cache.clear()
+        self.assertEqual(
+            trending.trending_post_ids(), [self.old.pk, self.fresh.pk])
+        self.assertEqual(
+            trending.group_leaderboard(), [self.group, self.quiet_group])
+
+    def test_follow_counts_for_latest_post(self):
+        """Подписка засчитывается последнему посту автора."""
+        self.publish()
+        before = self.fresh.trending.score
+        trending.follow_gained(self.author.username, timezone.now())
+        self.fresh.trending.refresh_from_db()
+        self.assertGreater(self.fresh.trending.score, before)
+
+    def test_concurrent_first_event(self):
+        """Строка, созданная параллельным событием, дополняется."""
+        PostScore.objects.create(pk=self.fresh.pk, score=1.0)
+        lookups = [PostScore.objects.none(), PostScore.objects.all()]
+        with mock.patch.object(
+                PostScore.objects, 'select_for_update', side_effect=lookups):
+            trending.add(PostScore, self.fresh.pk, 1.0)
+        self.assertEqual(PostScore.objects.get(pk=self.fresh.pk).score, 2.0)
+
+    def test_recompute_matches_incremental(self):
+        """Пакетный пересчет дает те же оценки, что и события."""
+        self.publish()
+        comment = Comment.objects.create(
+            text='Ого', author=self.reader, post=self.old)
+        trending.comment_added(comment)
+        follow = Follow.objects.create(user=self.reader, author=self.author)
+        trending.follow_gained(self.author.username, follow.created)
+        incremental = dict(GroupScore.objects.values_list('group', 'score'))
+        self.assertEqual(trending.recompute(), 2)
+        recomputed = dict(GroupScore.objects.values_list('group', 'score'))
+        self.assertEqual(incremental.keys(), recomputed.keys())
+        for group_id, score in incremental.items():
+            self.assertAlmostEqual(recomputed[group_id], score)
+
+    def test_trending_page_cost(self):
+        """Популярное стоит не дороже хронологической ленты."""
+        self.publish()
+        client = Client()
+        client.get(reverse('posts:trending'))
+        with self.assertNumQueries(1):
+            response = client.get(reverse('posts:trending'))
+        self.assertEqual(
+            list(response.context['page_obj']), [self.fresh, self.old])
+        response = client.get(reverse('posts:group_list', args=('quiet',)))
+        self.assertEqual(
+            response.context['leaderboard'], [self.quiet_group, self.group])
@@ -0,0 +1,64 @@
+from django.test import TestCase
+from django.urls import NoReverseMatch, reverse
+
+from posts.models import Group, Post, User
+from posts.urlbuilders import post_url
+
+
+class UrlBuilderTests(TestCase):
+    def test_builders_match_reverse(self):
+        """Построители адресов совпадают с reverse()."""
+        cases = (
+            ('index', ()),
+            ('profile', ('Иван Петров',)),
+            ('profile', ('a+b@c.d',)),
+            ('post_detail', (7,)),
+            ('post_edit', (7,)),
+            ('group_list', ('test-slug',)),
+            ('add_comment', (7,)),
+            ('follow_index', ()),
+            ('profile_follow', ('Bob',)),
+            ('profile_unfollow', ('Bob',)),
+        )
+        for name, args in cases:
+            with self.subTest(name=name, args=args):
+                self.assertEqual(
+                    post_url(name, *args),
+                    reverse(f'posts:{name}', args=args),
+                )
+
+    def test_wrong_arguments(self):
+        """Неверное число аргументов вызывает ошибку."""
+        with self.assertRaises(TypeError):
+            post_url('post_detail')
+
+    def test_arguments_checked_like_reverse(self):
+        """Аргументы не по регулярке маршрута отвергаются, как в reverse()."""
+        cases = (
+            ('post_detail', ('abc',)),
+            ('post_detail', (-1,)),
+            ('group_list', ('a/b',)),
+            ('group_list', ('слаг',)),
+            ('profile', ('',)),
+            ('profile', ('a/b',)),
+        )
+        for name, args in cases:
+            with self.subTest(name=name, args=args):
+                with self.assertRaises(NoReverseMatch):
+                    reverse(f'posts:{name}', args=args)
+                with self.assertRaises(NoReverseMatch):
+                    post_url(name, *args)
+
+    def test_models_absolute_url(self):
+        """Модели отдают адреса своих страниц."""
+        user = User.objects.create_user(username='Url')
+        group = Group.objects.create(title='Группа', slug='url')
+        post = Post.objects.create(text='Пост', author=user, group=group)
+        self.assertEqual(
+            post.get_absolute_url(),
+            reverse('posts:post_detail', args=(post.id,)),
+        )
+        self.assertEqual(
+            group.get_absolute_url(),
+            reverse('posts:group_list', args=(group.slug,)),
+        )
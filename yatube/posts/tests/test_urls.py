@@ -163,8 +163,9 @@ class TaskURLTests(TestCase):
                 elif name == 'posts:profile_unfollow':
                     response = self.authorized_client.post(reverse(
                         name, args=(argument)), follow=True)
-                    self.assertEqual(
-                        response.status_code, HTTPStatus.NOT_FOUND
+                    self.assertRedirects(
+                        response,
+                        (reverse('posts:profile', args=(self.user,)))
                     )
                 else:
                     response = response = self.authorized_client.post(
@@ -0,0 +1,46 @@
+from django.core.paginator import Paginator
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Group, Post, User
+from posts.utils import ELLIPSIS, get_page_window
+
+
+class PageWindowTests(TestCase):
+    def window(self, number, num_pages=100):
+        page_obj = Paginator(range(num_pages), 1).page(number)
+        return get_page_window(page_obj, on_each_side=2, on_ends=1)
+
+    def test_small_paginator_shows_all_pages(self):
+        """Если страниц мало, показываются все."""
+        self.assertEqual(self.window(3, num_pages=7), list(range(1, 8)))
+
+    def test_window_in_the_middle(self):
+        """В середине — края, соседи и пропуски."""
+        self.assertEqual(
+            self.window(50), [1, ELLIPSIS, 48, 49, 50, 51, 52, ELLIPSIS, 100]
+        )
+
+    def test_window_at_the_edges(self):
+        """У краев пропуск только с одной стороны."""
+        self.assertEqual(self.window(1), [1, 2, 3, ELLIPSIS, 100])
+        self.assertEqual(self.window(100), [1, ELLIPSIS, 98, 99, 100])
+        self.assertEqual(self.window(4), [1, 2, 3, 4, 5, 6, ELLIPSIS, 100])
+
+    @override_settings(POST_PER_PAGE=1)
+    def test_group_page_renders_window(self):
+        """Страница группы выводит не все номера страниц."""
+        user = User.objects.create_user(username='Pager')
+        group = Group.objects.create(title='Группа', slug='pager')
+        Post.objects.bulk_create(
+            Post(text=f'Пост {number}', author=user, group=group)
+            for number in range(50)
+        )
+        response = Client().get(
+            reverse('posts:group_list', args=(group.slug,)), {'page': 25})
+        self.assertEqual(response.content.decode().count('page-item'), 13)
+
+    def test_since_ignores_non_decimal_digits(self):
+        """Цифры вроде «²» в since не ломают ленту."""
+        response = Client().get(reverse('posts:index'), {'since': '²'})
+        self.assertEqual(response.status_code, 200)
@@ -53,7 +53,7 @@ class TaskPagesTests(TestCase):
 
     def test_paginator(self):
         """Paginator работает коректно."""
-        self.authorized_client_follower.get(reverse(
+        self.authorized_client_follower.post(reverse(
             'posts:profile_follow', args=(self.user,)
         ))
         Post.objects.all().delete()
@@ -180,8 +180,10 @@ class TaskPagesTests(TestCase):
         response_3 = self.client.get(
             reverse('posts:index')
         )
-        self.assertEqual(response_1.content, response_2.content)
-        self.assertNotEqual(response_1.content, response_3.content)
+        article = f'data-post-id="{self.post.id}"'.encode()
+        self.assertIn(article, response_1.content)
+        self.assertIn(article, response_2.content)
+        self.assertNotIn(article, response_3.content)
 
     def test_follow_user(self):
         """Проверка подписки на автора."""
@@ -226,19 +228,19 @@ class TaskPagesTests(TestCase):
     def test_follow_my(self):
         """Нельзя подписаться на самого себя."""
         count_old = Follow.objects.count()
-        self.authorized_client.get(reverse(
+        self.authorized_client.post(reverse(
             'posts:profile_follow', args=(self.user,)
         ))
         self.assertEqual(Follow.objects.count(), count_old)
 
     def test_two_follow(self):
         """Нельзя подписаться на одного и тогоже автора 2 раза."""
-        self.authorized_client_follower.get(reverse(
+        self.authorized_client_follower.post(reverse(
             'posts:profile_follow', args=(self.user,)
         ))
         count_old = Follow.objects.count()
         self.assertEqual(count_old, 1)
-        self.authorized_client_follower.get(reverse(
+        self.authorized_client_follower.post(reverse(
             'posts:profile_follow', args=(self.user,)
         ))
         count_after = Follow.objects.count()
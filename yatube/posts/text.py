@@ -0,0 +1,109 @@
+import re
+
+from django.utils.html import escape
+
+from .urlbuilders import post_url
+
+# Увеличьте при изменении разметки: rerender_posts перерисует посты.
+VERSION = 2
+
+re_paragraphs = re.compile(r'\n\s*\n')
+re_tokens = re.compile(
+    r'(?P<code>`[^`\n]+`)'
+    r'|(?P<url>https?://[^\s<>"\'`]+)'
+    r'|(?<![\w@])@(?P<mention>[\w.+-]*\w)'
+    r'|(?<![\w#&])#(?P<tag>\w{1,100})(?!\w)'
+)
+re_strong = re.compile(r'\*\*(?=\S)(.+?)(?<=\S)\*\*')
+re_em = re.compile(r'(?<![\w*])\*(?=\S)(.+?)(?<=\S)\*(?![\w*])')
+URL_TRAILING = '.,;:!?)'
+
+
+def render_plain(text):
+    text = escape(text)
+    text = re_strong.sub(r'<strong>\1</strong>', text)
+    return re_em.sub(r'<em>\1</em>', text)
+
+
+def render_token(match):
+    if match['code']:
+        return f'<code>{escape(match["code"][1:-1])}</code>', ''
+    if match['url']:
+        url = match['url']
+        trimmed = url.rstrip(URL_TRAILING)
+        return (
+            f'<a href="{escape(trimmed)}" rel="nofollow noopener">'
+            f'{escape(trimmed)}</a>',
+            url[len(trimmed):],
+        )
+    if match['tag']:
+        name = match['tag'].lower()
+        return (
+            f'<a href="{escape(post_url("tag_posts", name))}">'
+            f'#{escape(match["tag"])}</a>',
+            '',
+        )
+    username = match['mention']
+    return (
+        f'<a href="{escape(post_url("profile", username))}">'
+        f'@{escape(username)}</a>',
+        '',
+    )
+
+
+def render_line(line):
+    parts = []
+    position = 0
+    for match in re_tokens.finditer(line):
+        html, rest = render_token(match)
+        parts += [render_plain(line[position:match.start()]), html]
+        parts.append(render_plain(rest))
+        position = match.end()
+    parts.append(render_plain(line[position:]))
+    return ''.join(parts)
+
+
+def render(text):
+    """
+    Безопасная разметка поста: весь текст экранируется, затем
+    распознаются абзацы, переносы строк, **жирный**, *курсив*, `код`,
+    ссылки http(s), упоминания @username и хештеги #tag.
+    """
+    paragraphs = re_paragraphs.split(text.replace('\r\n', '\n').strip())
+    return '\n\n'.join(
+        '<p>{}</p>'.format('<br>'.join(
+            render_line(line) for line in paragraph.split('\n')))
+        for paragraph in paragraphs if paragraph
+    )
+
+
+def extract(text):
+    """Хештеги (в нижнем регистре) и имена упомянутых пользователей."""
+    tags, usernames = set(), set()
+    for match in re_tokens.finditer(text):
+        if match['tag']:
+            tags.add(match['tag'].lower())
+        elif match['mention']:
+            usernames.add(match['mention'])
+    return tags, usernames
+
+
+def rerender(posts, chunk_size=500):
+    """Перерисовывает посты с устаревшей версией разметки пачками;
+    возвращает число обновленных постов."""
+    stale = posts.exclude(text_version=VERSION).only(
+        'id', 'text', 'excerpt').order_by('pk')
+    updated = 0
+    last_pk = 0
+    while True:
+        batch = list(stale.filter(pk__gt=last_pk)[:chunk_size])
+        if not batch:
+            return updated
+        for post in batch:
+            post.text_html = render(post.text)
+            post.excerpt_html = render(post.excerpt)
+            post.text_version = VERSION
+        posts.model.objects.bulk_update(
+            batch, ['text_html', 'excerpt_html', 'text_version'])
+        updated += len(batch)
+        last_pk = batch[-1].pk
@@ -0,0 +1,142 @@
+import math
+from bisect import bisect_right
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from .models import Comment, Follow, Group, GroupScore, Post, PostScore
+
+POSTS_CACHE_KEY = 'trending:posts'
+GROUPS_CACHE_KEY = 'trending:groups'
+
+
+def weight(value, when):
+    """Вклад события в log2-шкале. Каждые TRENDING_HALF_LIFE часов вклад
+    новых событий удваивается, поэтому старые оценки затухают без
+    пересчета, а логарифм не дает числам переполниться."""
+    hours = (when - settings.TRENDING_EPOCH).total_seconds() / 3600
+    return math.log2(value) + hours / settings.TRENDING_HALF_LIFE
+
+
+def log_add(first, second):
+    if first is None:
+        return second
+    high, low = max(first, second), min(first, second)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def add(model, pk, score):
+    """Добавляет оценку события; строку, которую успело создать
+    параллельное событие, дополняет, а не падает."""
+    with transaction.atomic():
+        row = model.objects.select_for_update().filter(pk=pk).first()
+        if row is None:
+            try:
+                with transaction.atomic():
+                    model.objects.create(pk=pk, score=score)
+                return
+            except IntegrityError:
+                row = model.objects.select_for_update().get(pk=pk)
+        row.score = log_add(row.score, score)
+        row.save(update_fields=['score'])
+
+
+def engage(post_id, group_id, value, when):
+    score = weight(value, when)
+    add(PostScore, post_id, score)
+    if group_id is not None:
+        add(GroupScore, group_id, score)
+
+
+def post_published(post):
+    engage(post.pk, post.group_id, settings.TRENDING_POST_WEIGHT,
+           post.pub_date)
+
+
+def comment_added(comment):
+    group_id = Post.objects.filter(
+        pk=comment.post_id).values_list('group_id', flat=True).first()
+    engage(comment.post_id, group_id, settings.TRENDING_COMMENT_WEIGHT,
+           comment.created)
+
+
+def follow_gained(username, when):
+    """Новый подписчик засчитывается последнему посту автора."""
+    post = Post.objects.filter(
+        author__username=username, pub_date__lte=when,
+    ).order_by('-pub_date').only('id', 'group_id').first()
+    if post is not None:
+        engage(post.pk, post.group_id, settings.TRENDING_FOLLOW_WEIGHT, when)
+
+
+def recompute():
+    """Пересчитывает оценки постов за TRENDING_WINDOW дней с нуля."""
+    since = timezone.now() - timedelta(days=settings.TRENDING_WINDOW)
+    posts = Post.objects.filter(pub_date__gte=since).order_by('pub_date')
+    post_groups = {}
+    by_author = defaultdict(list)
+    scores = {}
+    for post_id, author_id, group_id, pub_date in posts.values_list(
+            'id', 'author_id', 'group_id', 'pub_date').iterator():
+        post_groups[post_id] = group_id
+        by_author[author_id].append((pub_date, post_id))
+        scores[post_id] = weight(settings.TRENDING_POST_WEIGHT, pub_date)
+    comments = Comment.objects.filter(post__in=posts).values_list(
+        'post_id', 'created')
+    for post_id, created in comments.iterator():
+        scores[post_id] = log_add(
+            scores[post_id], weight(settings.TRENDING_COMMENT_WEIGHT, created))
+    follows = Follow.objects.filter(
+        author_id__in=by_author, created__gte=since,
+    ).values_list('author_id', 'created')
+    for author_id, created in follows.iterator():
+        published = by_author[author_id]
+        index = bisect_right(published, (created, math.inf)) - 1
+        if index >= 0:
+            post_id = published[index][1]
+            scores[post_id] = log_add(
+                scores[post_id],
+                weight(settings.TRENDING_FOLLOW_WEIGHT, created),
+            )
+    group_scores = {}
+    for post_id, score in scores.items():
+        group_id = post_groups[post_id]
+        if group_id is not None:
+            group_scores[group_id] = log_add(
+                group_scores.get(group_id), score)
+    with transaction.atomic():
+        PostScore.objects.all().delete()
+        PostScore.objects.bulk_create(
+            PostScore(post_id=post_id, score=score)
+            for post_id, score in scores.items()
+        )
+        GroupScore.objects.all().delete()
+        GroupScore.objects.bulk_create(
+            GroupScore(group_id=group_id, score=score)
+            for group_id, score in group_scores.items()
+        )
+    cache.delete_many([POSTS_CACHE_KEY, GROUPS_CACHE_KEY])
+    return len(scores)
+
+
+def trending_post_ids():
+    ids = cache.get(POSTS_CACHE_KEY)
+    if ids is None:
+        ids = list(PostScore.objects.order_by('-score').values_list(
+            'post_id', flat=True)[:settings.TRENDING_LIST_SIZE])
+        cache.set(POSTS_CACHE_KEY, ids, settings.TRENDING_LIST_TIMEOUT)
+    return ids
+
+
+def group_leaderboard():
+    groups = cache.get(GROUPS_CACHE_KEY)
+    if groups is None:
+        groups = list(Group.objects.filter(
+            trending__isnull=False).order_by('-trending__score')[
+                :settings.TRENDING_GROUPS])
+        cache.set(GROUPS_CACHE_KEY, groups, settings.TRENDING_LIST_TIMEOUT)
+    return groups
@@ -0,0 +1,58 @@
+import re
+from urllib.parse import quote
+
+from django.urls import NoReverseMatch, get_script_prefix, reverse
+from django.urls.converters import get_converter
+from django.utils.http import RFC3986_SUBDELIMS
+
+PARAMETER = re.compile(r'<(?:(?P<converter>[^>:]+):)?(?P<parameter>\w+)>')
+SAFE_CHARS = RFC3986_SUBDELIMS + '/~:@'
+
+
+class UrlBuilder:
+    """Собирает адрес по шаблону маршрута без обхода резолвера;
+    аргументы, как и в reverse(), проверяются регулярками конвертеров."""
+
+    def __init__(self, base, route):
+        self.converters = []
+        for match in PARAMETER.finditer(route):
+            converter = get_converter(match.group('converter') or 'str')
+            self.converters.append(
+                (converter, re.compile(converter.regex)))
+        route = route.replace('{', '{{').replace('}', '}}')
+        self.template = base + PARAMETER.sub('{}', route)
+
+    def to_url(self, converter, regex, arg):
+        value = converter.to_url(arg)
+        if not regex.fullmatch(value):
+            raise NoReverseMatch(
+                f'Аргумент {arg!r} не подходит для {self.template}')
+        return quote(value, safe=SAFE_CHARS)
+
+    def __call__(self, *args):
+        if len(args) != len(self.converters):
+            raise TypeError(
+                f'Ожидается аргументов: {len(self.converters)}'
+            )
+        return get_script_prefix() + self.template.format(*(
+            self.to_url(converter, regex, arg)
+            for (converter, regex), arg in zip(self.converters, args)
+        ))
+
+
+_builders = {}
+
+
+def get_builders():
+    if not _builders:
+        from . import urls
+        base = reverse(f'{urls.app_name}:index')[len(get_script_prefix()):]
+        _builders.update(
+            (pattern.name, UrlBuilder(base, str(pattern.pattern)))
+            for pattern in urls.urlpatterns
+        )
+    return _builders
+
+
+def post_url(name, *args):
+    return get_builders()[name](*args)
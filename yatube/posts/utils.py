@@ -1,8 +1,110 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
 from django.core.paginator import Paginator
 from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+ELLIPSIS = '…'
+
+
+def get_page_window(page_obj, on_each_side=None, on_ends=None):
+    """Номера страниц вокруг текущей и по краям, пропуски — ELLIPSIS."""
+    if on_each_side is None:
+        on_each_side = settings.PAGINATOR_ON_EACH_SIDE
+    if on_ends is None:
+        on_ends = settings.PAGINATOR_ON_ENDS
+    num_pages = page_obj.paginator.num_pages
+    number = page_obj.number
+    if num_pages <= (on_each_side + on_ends) * 2 + 1:
+        return list(range(1, num_pages + 1))
+    window = []
+    if number > on_each_side + on_ends + 1:
+        window += list(range(1, on_ends + 1)) + [ELLIPSIS]
+        window += range(number - on_each_side, number + 1)
+    else:
+        window += range(1, number + 1)
+    if number < num_pages - on_each_side - on_ends:
+        window += range(number + 1, number + on_each_side + 1)
+        window += [ELLIPSIS] + list(
+            range(num_pages - on_ends + 1, num_pages + 1))
+    else:
+        window += range(number + 1, num_pages + 1)
+    return window
 
 
-def get_paginator(request, posts):
+def get_paginator(request, posts, count=None):
     paginator = Paginator(posts, settings.POST_PER_PAGE)
+    if count is not None:
+        paginator.count = count
     page_number = request.GET.get('page')
-    return paginator.get_page(page_number)
+    page_obj = paginator.get_page(page_number)
+    page_obj.page_window = get_page_window(page_obj)
+    return page_obj
+
+
+def chunked(iterable, size):
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def filter_since(request, posts):
+    since = request.GET.get('since', '')
+    if since.isdecimal():
+        return posts.filter(id__gt=since)
+    return posts
+
+
+def wants_json(request):
+    return 'application/json' in request.META.get('HTTP_ACCEPT', '')
+
+
+def encode_cursor(value, pk):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return base64.urlsafe_b64encode(json.dumps([value, pk]).encode()).decode()
+
+
+def decode_cursor(cursor, is_datetime=False):
+    """Позиция (значение, pk) или None для поврежденного курсора;
+    значение — дата или целое число, смотря по is_datetime."""
+    try:
+        value, pk = json.loads(base64.urlsafe_b64decode(cursor))
+        if value is not None:
+            if is_datetime:
+                value = parse_datetime(value)
+                if value is None:
+                    return None
+            elif type(value) is not int:
+                return None
+        return value, int(pk)
+    except (binascii.Error, TypeError, ValueError):
+        return None
+
+
+def get_cursor_page(request, rows, pk_field='id'):
+    """Страница по курсору (pub_date, pk_field) от новых к старым."""
+    rows = rows.order_by('-pub_date', f'-{pk_field}')
+    position = decode_cursor(request.GET.get('cursor', ''), True)
+    if position and position[0] is not None:
+        pub_date, pk = position
+        rows = rows.filter(
+            Q(pub_date__lt=pub_date)
+            | Q(pub_date=pub_date, **{f'{pk_field}__lt': pk})
+        )
+    size = settings.POST_PER_PAGE
+    page = list(rows[:size + 1])
+    next_cursor = None
+    if len(page) > size:
+        last = page[size - 1]
+        next_cursor = encode_cursor(last.pub_date, getattr(last, pk_field))
+    return page[:size], next_cursor
@@ -1,57 +1,222 @@
+from datetime import date
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
+from django.db.models import Count, Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.http import (
+    Http404, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404, redirect, render
+from django.views.decorators.http import require_POST
 
-from .utils import get_paginator
+from .archive import (
+    INDEX, author_scope, group_scope, month_count, month_range, sidebar,
+)
+from .events import event_stream, snapshot
+from .export import export_zip
+from .follows import author_exists, follow, unfollow
+from .groups import SORTS, get_cached_page
+from .lookups import authors, groups
+from .streaming import render_feed, render_page
+from .utils import (
+    filter_since, get_cursor_page, get_paginator, wants_json,
+)
 from .forms import PostForm, CommentForm
-from .models import Group, Post, Follow, User
+from .models import Follow, Post, Tag, User
+from .notifications import mark_read
+from .recommendations import get_recommendations
+from .trending import group_leaderboard, trending_post_ids
+
+
+def count_of(model, field):
+    rows = model.objects.filter(**{field: OuterRef('pk')}).order_by()
+    return Coalesce(Subquery(
+        rows.values(field).annotate(count=Count('pk')).values('count')), 0)
 
 
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
-    post = author.posts.select_related('group').all()
-    page_obj = get_paginator(request, post)
-    following = (request.user.is_authenticated) and (
-        request.user.follower.filter(author=author))
+    author_id = authors.get_or_404(username).pk
+    viewer = request.user
+    author = User.objects.annotate(
+        posts_count=count_of(Post, 'author'),
+        following_count=count_of(Follow, 'author'),
+        follower_count=count_of(Follow, 'user'),
+        is_following=Exists(Follow.objects.filter(
+            user=viewer.pk if viewer.is_authenticated else None,
+            author=OuterRef('pk'),
+        )),
+    ).get(pk=author_id)
+    posts = filter_since(request, author.posts.for_list('group'))
+    page_obj = get_paginator(
+        request, posts,
+        count=None if 'since' in request.GET else author.posts_count,
+    )
+    for post in page_obj:
+        post.author = author
     context = {
-        'following': following,
+        'following': author.is_following,
         'author': author,
         'page_obj': page_obj,
+        'recommendations': get_recommendations(viewer),
+        'archive': sidebar(
+            author_scope(author.pk), 'profile_archive', author.username),
     }
-    return render(request, 'posts/profile.html', context)
+    return render_feed(
+        request, 'posts/profile.html', context, show_profile=True)
 
 
 def post_detail(request, post_id):
-    post = get_object_or_404(
-        Post.objects.select_related(
-            'author').prefetch_related('comments__author'), pk=post_id
-    )
+    posts = Post.objects.select_related('author')
+    if not settings.STREAMING_RESPONSES:
+        posts = posts.prefetch_related('comments__author')
+    post = get_object_or_404(posts, pk=post_id)
     form = CommentForm(request.POST or None)
     context = {
         'form': form,
         'comment': post.comments.all(),
         'post': post,
     }
-    return render(request, 'posts/post_detail.html', context)
+    return render_page(
+        request, 'posts/post_detail.html', context,
+        items=post.comments.select_related('author'),
+        item_template='posts/includes/comment.html',
+        item_name='commentic',
+    )
 
 
 def index(request):
-    posts = Post.objects.select_related('group', 'author').all()
-    page_obj = get_paginator(request, posts)
+    posts = Post.objects.for_list()
+    page_obj = get_paginator(request, filter_since(request, posts))
     context = {
         'page_obj': page_obj,
+        'archive': sidebar(INDEX, 'archive'),
     }
-    return render(request, 'posts/index.html', context)
+    return render_feed(request, 'posts/index.html', context)
 
 
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
-    posts = group.posts.select_related('author').all()
-    page_obj = get_paginator(request, posts)
+    group = groups.get_or_404(slug)
+    posts = group.posts.for_list('author')
+    page_obj = get_paginator(request, filter_since(request, posts))
     context = {
         'group': group,
         'page_obj': page_obj,
+        'leaderboard': group_leaderboard(),
+        'archive': sidebar(group_scope(group.pk), 'group_archive', group.slug),
+    }
+    return render_feed(
+        request, 'posts/group_list.html', context, show_group=True)
+
+
+def archive_page(request, scope, posts, year, month, context, **extra):
+    """Посты ленты за месяц; число постов берется из счетчиков архива."""
+    start, end = month_range(year, month)
+    page_obj = get_paginator(
+        request,
+        posts.filter(pub_date__gte=start, pub_date__lt=end),
+        count=month_count(scope, year, month),
+    )
+    context.update({
+        'page_obj': page_obj,
+        'month': date(year, month, 1),
+    })
+    return render_feed(request, 'posts/archive.html', context, **extra)
+
+
+def archive(request, year, month):
+    context = {
+        'archive': sidebar(INDEX, 'archive'),
+    }
+    return archive_page(
+        request, INDEX, Post.objects.for_list(), year, month, context)
+
+
+def group_archive(request, slug, year, month):
+    group = groups.get_or_404(slug)
+    scope = group_scope(group.pk)
+    context = {
+        'group': group,
+        'archive': sidebar(scope, 'group_archive', group.slug),
+    }
+    return archive_page(
+        request, scope, group.posts.for_list('author'), year, month,
+        context, show_group=True,
+    )
+
+
+def profile_archive(request, username, year, month):
+    author = authors.get_or_404(username)
+    scope = author_scope(author.pk)
+    context = {
+        'author': author,
+        'archive': sidebar(scope, 'profile_archive', author.username),
+    }
+    return archive_page(
+        request, scope, author.posts.for_list(), year, month,
+        context, show_profile=True,
+    )
+
+
+def group_index(request):
+    sort = request.GET.get('sort')
+    if sort not in SORTS:
+        sort = 'activity'
+    groups, next_cursor = get_cached_page(sort, request.GET.get('cursor'))
+    context = {
+        'groups': groups,
+        'sort': sort,
+        'next_cursor': next_cursor,
+    }
+    return render(request, 'posts/group_index.html', context)
+
+
+def linked_posts(request, links):
+    links, next_cursor = get_cursor_page(request, links, 'post_id')
+    posts = Post.objects.for_list().in_bulk(
+        [link.post_id for link in links])
+    return [
+        posts[link.post_id] for link in links if link.post_id in posts
+    ], next_cursor
+
+
+def tag_posts(request, name):
+    tag = get_object_or_404(Tag, name=name.lower())
+    posts, next_cursor = linked_posts(
+        request, tag.post_links.only('post_id', 'pub_date'))
+    context = {
+        'tag': tag,
+        'posts': posts,
+        'next_cursor': next_cursor,
+    }
+    return render_feed(
+        request, 'posts/tag_posts.html', context, items=posts)
+
+
+@login_required
+def mentions(request):
+    posts, next_cursor = linked_posts(
+        request, request.user.mentions.only('post_id', 'pub_date'))
+    context = {
+        'posts': posts,
+        'next_cursor': next_cursor,
+    }
+    return render_feed(
+        request, 'posts/mentions.html', context, items=posts)
+
+
+def trending(request):
+    page_obj = get_paginator(request, trending_post_ids())
+    posts = Post.objects.for_list().in_bulk(
+        page_obj.object_list)
+    page_obj.object_list = [
+        posts[post_id] for post_id in page_obj.object_list
+        if post_id in posts
+    ]
+    context = {
+        'page_obj': page_obj,
     }
-    return render(request, 'posts/group_list.html', context)
+    return render_feed(request, 'posts/trending.html', context)
 
 
 @login_required
@@ -105,25 +270,94 @@ def add_comment(request, post_id):
 def follow_index(request):
     follower = request.user
     posts_list = Post.objects.filter(
-        author__following__user=follower).select_related('author')
-    page_obj = get_paginator(request, posts_list)
+        author__following__user=follower).for_list()
+    page_obj = get_paginator(request, filter_since(request, posts_list))
     context = {
         'page_obj': page_obj,
+        'recommendations': get_recommendations(follower),
     }
-    return render(request, 'posts/follow.html', context)
+    return render_feed(request, 'posts/follow.html', context)
 
 
 @login_required
+@require_POST
 def profile_follow(request, username):
-    follower = request.user
-    author = get_object_or_404(User, username=username)
-    if follower != author:
-        Follow.objects.get_or_create(user=request.user, author=author)
-    return redirect('posts:profile', author)
+    if not follow(request.user, username) and not author_exists(username):
+        raise Http404
+    return follow_response(
+        request, username, username != request.user.username)
 
 
 @login_required
+@require_POST
 def profile_unfollow(request, username):
-    get_object_or_404(
-        Follow, user=request.user, author__username=username).delete()
+    if not unfollow(request.user, username) and not author_exists(username):
+        raise Http404
+    return follow_response(request, username, False)
+
+
+def follow_response(request, username, following):
+    if wants_json(request):
+        return JsonResponse({'following': following})
     return redirect('posts:profile', username)
+
+
+@login_required
+def notifications(request):
+    notifications_list = request.user.notifications.select_related(
+        'author', 'post')
+    page_obj = get_paginator(request, notifications_list)
+    context = {
+        'page_obj': page_obj,
+    }
+    response = render(request, 'posts/notifications.html', context)
+    mark_read(
+        request.user,
+        [notification.pk for notification in page_obj.object_list],
+    )
+    return response
+
+
+@login_required
+def export(request):
+    response = StreamingHttpResponse(
+        export_zip(request.user), content_type='application/zip')
+    response['Content-Disposition'] = (
+        f'attachment; filename="yatube-{request.user.username}.zip"')
+    return response
+
+
+def feed_events(request):
+    feed = request.GET.get('feed', 'index')
+    if feed == 'index':
+        posts = Post.objects.all()
+        channels = ['index']
+    elif feed == 'group':
+        group = groups.get_or_404(request.GET.get('slug', ''))
+        posts = group.posts.all()
+        channels = [f'group:{group.id}']
+    elif feed == 'follow' and request.user.is_authenticated:
+        authors = list(
+            request.user.follower.values_list('author_id', flat=True))
+        posts = Post.objects.filter(author_id__in=authors)
+        channels = [f'author:{author}' for author in authors]
+    else:
+        return HttpResponseBadRequest()
+    since = request.GET.get('since', '')
+    since = int(since) if since.isdecimal() else 0
+    if not (settings.FEED_EVENTS_STREAM
+            and 'text/event-stream' in request.META.get('HTTP_ACCEPT', '')):
+        return JsonResponse(snapshot(posts, since))
+    last_event_id = request.META.get('HTTP_LAST_EVENT_ID', '')
+    response = StreamingHttpResponse(
+        event_stream(
+            posts,
+            channels,
+            since,
+            int(last_event_id) if last_event_id.isdecimal() else 0,
+        ),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
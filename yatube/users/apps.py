@@ -3,3 +3,9 @@ from django.apps import AppConfig
 
 class UsersConfig(AppConfig):
     name = 'users'
+
+    def ready(self):
+        from django.contrib.auth.password_validation import (
+            get_default_password_validators,
+        )
+        get_default_password_validators()
@@ -0,0 +1,27 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+from core.auth import CachedModelBackend
+
+from .hashers import limit_hashing, verify_password
+
+User = get_user_model()
+
+
+class OffloadedModelBackend(CachedModelBackend):
+    """Хеши паролей считаются не больше PASSWORD_HASH_CONCURRENCY разом."""
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(User.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = User._default_manager.get_by_natural_key(username)
+        except User.DoesNotExist:
+            limit_hashing(make_password, password)
+            return None
+        if verify_password(user, password) and self.user_can_authenticate(
+                user):
+            return user
+        return None
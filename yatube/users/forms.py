@@ -8,3 +8,12 @@ User = get_user_model()
 class CreationForm(UserCreationForm):
     class Meta(UserCreationForm.Meta):
         fields = ('first_name', 'last_name', 'username', 'email')
+
+    def validate_unique(self):
+        """Уникальность username проверяет ограничение БД при вставке."""
+
+    def add_duplicate_error(self):
+        self.add_error(
+            'username',
+            User._meta.get_field('username').error_messages['unique'],
+        )
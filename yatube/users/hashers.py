@@ -0,0 +1,57 @@
+import threading
+
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher, check_password, get_hasher, identify_hasher,
+    make_password,
+)
+
+_slots = None
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2 с числом итераций из PASSWORD_HASH_ITERATIONS."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+
+def get_slots():
+    global _slots
+    if _slots is None:
+        _slots = threading.BoundedSemaphore(
+            settings.PASSWORD_HASH_CONCURRENCY)
+    return _slots
+
+
+def limit_hashing(func, *args):
+    """
+    Считает хеш в потоке запроса, но не больше PASSWORD_HASH_CONCURRENCY
+    одновременно на процесс: остальные запросы ждут своей очереди и не
+    отнимают ядра у уже начатых проверок.
+    """
+    with get_slots():
+        return func(*args)
+
+
+def needs_rehash(encoded):
+    preferred = get_hasher('default')
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False
+    return (
+        hasher.algorithm != preferred.algorithm
+        or preferred.must_update(encoded)
+    )
+
+
+def verify_password(user, password):
+    """Проверяет пароль и перехеширует его, если сменились настройки."""
+    if not limit_hashing(check_password, password, user.password):
+        return False
+    if needs_rehash(user.password):
+        user.password = limit_hashing(make_password, password)
+        user.save(update_fields=['password'])
+    return True
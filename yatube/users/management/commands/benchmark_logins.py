@@ -0,0 +1,46 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Измеряет число проверок пароля (входов) в секунду.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--seconds', type=float, default=3)
+        parser.add_argument(
+            '--workers', type=int, default=settings.PASSWORD_HASH_CONCURRENCY)
+
+    def measure(self, encoded, workers, seconds):
+        deadline = time.monotonic() + seconds
+
+        def worker():
+            done = 0
+            while time.monotonic() < deadline:
+                check_password('benchmark-password', encoded)
+                done += 1
+            return done
+
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            total = sum(pool.map(lambda _: worker(), range(workers)))
+        return total / (time.monotonic() - started)
+
+    def handle(self, seconds, workers, **options):
+        encoded = make_password('benchmark-password')
+        self.stdout.write(
+            f'PBKDF2 итераций: {settings.PASSWORD_HASH_ITERATIONS}, '
+            f'ядер: {os.cpu_count()}'
+        )
+        single = self.measure(encoded, 1, seconds)
+        self.stdout.write(f'1 поток: {single:.1f} входов/с')
+        if workers > 1:
+            pooled = self.measure(encoded, workers, seconds)
+            self.stdout.write(
+                f'{workers} потоков: {pooled:.1f} входов/с, '
+                f'{pooled / workers:.1f} на поток'
+            )
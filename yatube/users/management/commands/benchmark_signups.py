@@ -0,0 +1,49 @@
+import time
+from http import HTTPStatus
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import Client, override_settings
+from django.urls import reverse
+
+
+class Command(BaseCommand):
+    help = 'Измеряет число регистраций в секунду (изменения откатываются).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--number', type=int, default=50)
+        parser.add_argument('--iterations', type=int)
+
+    def handle(self, number, iterations, **options):
+        overrides = {}
+        if iterations:
+            overrides['PASSWORD_HASH_ITERATIONS'] = iterations
+        client = Client()
+        url = reverse('users:signup')
+        usernames = [f'benchmark-{index}' for index in range(number)]
+        failed = []
+        with override_settings(**overrides), transaction.atomic():
+            started = time.monotonic()
+            for username in usernames:
+                response = client.post(url, {
+                    'username': username,
+                    'email': f'{username}@example.com',
+                    'password1': 'Yatube-benchmark-2022',
+                    'password2': 'Yatube-benchmark-2022',
+                })
+                if response.status_code != HTTPStatus.FOUND:
+                    failed.append(f'{username}: {response.status_code}')
+            elapsed = time.monotonic() - started
+            created = get_user_model().objects.filter(
+                username__in=usernames).count()
+            transaction.set_rollback(True)
+        if failed or created != number:
+            raise CommandError(
+                f'Зарегистрировано {created} из {number}; ошибки: '
+                f'{", ".join(failed) or "нет"}'
+            )
+        self.stdout.write(
+            f'{number} регистраций за {elapsed:.2f} с: '
+            f'{number / elapsed:.1f} в секунду'
+        )
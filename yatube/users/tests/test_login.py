@@ -0,0 +1,101 @@
+from http import HTTPStatus
+
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import User
+from users.throttling import login_throttle
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class LoginTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='Login', password='pw')
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+
+    def login(self, password, username='Login'):
+        return self.client.post(
+            reverse('users:login'),
+            {'username': username, 'password': password},
+        )
+
+    def test_login_succeeds(self):
+        """Правильный пароль авторизует пользователя."""
+        response = self.login('pw')
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+
+    def test_rehash_on_login(self):
+        """При смене числа итераций пароль перехешируется при входе."""
+        with self.settings(PASSWORD_HASH_ITERATIONS=500):
+            User.objects.filter(pk=self.user.pk).update(
+                password=make_password('pw'))
+        self.login('pw')
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+
+    @override_settings(LOGIN_THROTTLE_USERNAME_LIMIT=3)
+    def test_throttle_by_username(self):
+        """После серии ошибок вход блокируется даже с верным паролем."""
+        for _ in range(3):
+            self.assertEqual(self.login('wrong').status_code, HTTPStatus.OK)
+        response = self.login('pw')
+        self.assertEqual(
+            response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+        self.assertTrue(response.context['throttled'])
+
+    @override_settings(LOGIN_THROTTLE_IP_LIMIT=2)
+    def test_throttle_by_ip(self):
+        """Ошибки с одного адреса блокируют вход под любым именем."""
+        self.login('wrong', username='a')
+        self.login('wrong', username='b')
+        response = self.login('pw')
+        self.assertEqual(
+            response.status_code, HTTPStatus.TOO_MANY_REQUESTS)
+
+    @override_settings(LOGIN_THROTTLE_USERNAME_LIMIT=2)
+    def test_attempt_counted_before_check(self):
+        """Попытка засчитывается сразу, до проверки пароля."""
+        request = RequestFactory().post(reverse('users:login'))
+        self.assertEqual(
+            [login_throttle.attempt(request, 'Login') for _ in range(3)],
+            [False, False, True],
+        )
+
+    @override_settings(LOGIN_THROTTLE_IP_LIMIT=2)
+    def test_success_not_counted_for_ip(self):
+        """Удачные входы не расходуют лимит адреса."""
+        for _ in range(3):
+            self.assertEqual(self.login('pw').status_code, HTTPStatus.FOUND)
+            self.client.logout()
+
+    @override_settings(LOGIN_THROTTLE_USERNAME_LIMIT=2)
+    def test_username_case_sensitive(self):
+        """Имена, отличающиеся регистром, блокируются отдельно."""
+        User.objects.create_user(username='login', password='pw')
+        self.login('wrong', username='login')
+        self.login('wrong', username='login')
+        self.assertEqual(self.login('pw').status_code, HTTPStatus.FOUND)
+
+    @override_settings(
+        LOGIN_THROTTLE_IP_LIMIT=2, LOGIN_THROTTLE_TRUSTED_PROXIES=1)
+    def test_throttle_by_forwarded_ip(self):
+        """За доверенным прокси клиенты различаются по X-Forwarded-For."""
+        for username in ('a', 'b'):
+            self.client.post(
+                reverse('users:login'),
+                {'username': username, 'password': 'wrong'},
+                HTTP_X_FORWARDED_FOR='203.0.113.1',
+            )
+        response = self.client.post(
+            reverse('users:login'),
+            {'username': 'Login', 'password': 'pw'},
+            HTTP_X_FORWARDED_FOR='203.0.113.2',
+        )
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
@@ -0,0 +1,65 @@
+from http import HTTPStatus
+from io import StringIO
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.models import User
+from users.forms import CreationForm
+from users.validators import PreloadedCommonPasswordValidator
+
+
+@override_settings(PASSWORD_HASH_ITERATIONS=1000)
+class SignUpTests(TestCase):
+    def signup(self, username):
+        return Client().post(reverse('users:signup'), {
+            'username': username,
+            'password1': 'Yatube-signup-2022',
+            'password2': 'Yatube-signup-2022',
+        })
+
+    def test_signup_is_single_insert(self):
+        """Регистрация не делает отдельной проверки username."""
+        with CaptureQueriesContext(connection) as queries:
+            response = self.signup('Newbie')
+        self.assertEqual(response.status_code, HTTPStatus.FOUND)
+        self.assertTrue(User.objects.filter(username='Newbie').exists())
+        selects = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('SELECT')
+        ]
+        self.assertEqual(selects, [])
+
+    def test_duplicate_username(self):
+        """Занятый username возвращает ошибку формы, а не 500."""
+        User.objects.create_user(username='Taken')
+        response = self.signup('Taken')
+        self.assertEqual(response.status_code, HTTPStatus.OK)
+        self.assertIn('username', response.context['form'].errors)
+        self.assertEqual(User.objects.filter(username='Taken').count(), 1)
+
+    def test_common_passwords_loaded_once(self):
+        """Экземпляры валидатора используют один загруженный список."""
+        first = PreloadedCommonPasswordValidator()
+        second = PreloadedCommonPasswordValidator()
+        self.assertIs(first.passwords, second.passwords)
+        form = CreationForm({
+            'username': 'Weak',
+            'password1': 'password',
+            'password2': 'password',
+        })
+        self.assertIn('password2', form.errors)
+
+    def test_benchmark_checks_signups(self):
+        """Бенчмарк откатывает регистрации и падает, если они не прошли."""
+        out = StringIO()
+        call_command('benchmark_signups', '--number', '2', stdout=out)
+        self.assertIn('2 регистраций', out.getvalue())
+        self.assertFalse(User.objects.filter(
+            username__startswith='benchmark-').exists())
+        User.objects.create_user(username='benchmark-1')
+        with self.assertRaisesMessage(CommandError, 'benchmark-1: 200'):
+            call_command('benchmark_signups', '--number', '2', stdout=out)
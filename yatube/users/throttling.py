@@ -0,0 +1,65 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+CACHE_KEY = 'login:{}'
+
+
+def client_ip(request):
+    """Адрес, который записал последний доверенный прокси."""
+    proxies = settings.LOGIN_THROTTLE_TRUSTED_PROXIES
+    forwarded = [
+        address.strip() for address
+        in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')
+        if address.strip()
+    ]
+    if proxies and len(forwarded) >= proxies:
+        return forwarded[-proxies]
+    return request.META.get('REMOTE_ADDR')
+
+
+class LoginThrottle:
+    """
+    Счетчики попыток входа в кэше с фиксированным окном
+    LOGIN_THROTTLE_PERIOD. Попытка засчитывается до проверки пароля, а
+    решение принимается по значению, которое вернул incr, поэтому
+    параллельные запросы не проходят лимит все разом.
+    """
+
+    def keys(self, request, username):
+        username = hashlib.md5(username.encode()).hexdigest()
+        return (
+            (CACHE_KEY.format(f'ip:{client_ip(request)}'),
+             settings.LOGIN_THROTTLE_IP_LIMIT),
+            (CACHE_KEY.format(f'user:{username}'),
+             settings.LOGIN_THROTTLE_USERNAME_LIMIT),
+        )
+
+    def hit(self, key):
+        cache.add(key, 0, settings.LOGIN_THROTTLE_PERIOD)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, settings.LOGIN_THROTTLE_PERIOD)
+            return 1
+
+    def attempt(self, request, username):
+        """Засчитывает попытку; True, если лимит уже исчерпан."""
+        counts = [
+            (self.hit(key), limit)
+            for key, limit in self.keys(request, username)
+        ]
+        return any(count > limit for count, limit in counts)
+
+    def succeeded(self, request, username):
+        """Удачный вход не считается ошибкой ни для адреса, ни для имени."""
+        (ip_key, _), (user_key, _) = self.keys(request, username)
+        cache.delete(user_key)
+        try:
+            cache.decr(ip_key)
+        except ValueError:
+            pass
+
+
+login_throttle = LoginThrottle()
@@ -1,5 +1,4 @@
 from django.contrib.auth.views import (
-    LoginView,
     LogoutView,
     PasswordChangeView,
     PasswordChangeDoneView,
@@ -23,7 +22,7 @@ urlpatterns = [
     ),
     path(
         'login/',
-        LoginView.as_view(template_name='users/login.html'),
+        views.ThrottledLoginView.as_view(),
         name='login'
     ),
     path(
@@ -0,0 +1,21 @@
+import threading
+
+from django.contrib.auth.password_validation import CommonPasswordValidator
+
+
+class PreloadedCommonPasswordValidator(CommonPasswordValidator):
+    """Список частых паролей читается из gzip один раз на процесс."""
+
+    loaded = {}
+    lock = threading.Lock()
+
+    def __init__(
+        self,
+        password_list_path=CommonPasswordValidator.DEFAULT_PASSWORD_LIST_PATH,
+    ):
+        key = str(password_list_path)
+        with self.lock:
+            if key not in self.loaded:
+                super().__init__(password_list_path)
+                self.loaded[key] = frozenset(self.passwords)
+        self.passwords = self.loaded[key]
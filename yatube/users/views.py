@@ -1,10 +1,43 @@
+from http import HTTPStatus
+
+from django.contrib.auth.views import LoginView
+from django.db import IntegrityError, transaction
+from django.http import HttpResponseRedirect
 from django.urls import reverse_lazy
 from django.views.generic import CreateView
 
 from .forms import CreationForm
+from .throttling import login_throttle
 
 
 class SignUp(CreateView):
     form_class = CreationForm
     success_url = reverse_lazy('posts:index')
     template_name = 'users/signup.html'
+
+    def form_valid(self, form):
+        try:
+            with transaction.atomic():
+                self.object = form.save()
+        except IntegrityError:
+            form.add_duplicate_error()
+            return self.form_invalid(form)
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class ThrottledLoginView(LoginView):
+    template_name = 'users/login.html'
+
+    def post(self, request, *args, **kwargs):
+        username = request.POST.get('username', '')
+        if login_throttle.attempt(request, username):
+            form = self.get_form_class()(
+                request, initial={'username': username})
+            context = self.get_context_data(form=form, throttled=True)
+            return self.render_to_response(
+                context, status=HTTPStatus.TOO_MANY_REQUESTS)
+        return super().post(request, *args, **kwargs)
+
+    def form_valid(self, form):
+        login_throttle.succeeded(self.request, form.get_user().get_username())
+        return super().form_valid(form)
@@ -1,6 +1,76 @@
 import os
+from datetime import datetime, timezone
 
 POST_PER_PAGE = 10
+POST_EXCERPT_LENGTH = 300
+TAG_INDEX_CHUNK_SIZE = 500
+PAGINATOR_ON_EACH_SIDE = 2
+PAGINATOR_ON_ENDS = 1
+
+STREAMING_RESPONSES = False
+STREAM_CHUNK_SIZE = 20
+
+API_MAX_PAGE_SIZE = 100
+API_BATCH_MAX_IDS = 100
+API_BATCH_CACHE_TIMEOUT = 60 * 5
+API_THUMBNAIL_SIZE = '960x339'
+
+# Рассылки и пересчеты идут в пуле из BACKGROUND_WORKERS потоков вне
+# запроса. SQLite допускает одного писателя, поэтому с ним по умолчанию
+# пула нет и задачи выполняются после коммита в текущем потоке; с
+# сервером БД задайте BACKGROUND_WORKERS в окружении.
+BACKGROUND_WORKERS = int(os.getenv('BACKGROUND_WORKERS', 0))
+
+NOTIFICATION_CHUNK_SIZE = 500
+NOTIFICATION_DIGEST = True
+
+FOLLOW_BULK_CHUNK_SIZE = 500
+API_BULK_FOLLOW_MAX = 1000
+FOLLOW_GRAPH_TTL = 60 * 10
+FOLLOW_GRAPH_CHUNK_SIZE = 2000
+FOLLOW_SUGGESTIONS = 10
+
+RECOMMENDATIONS_TOP_K = 5
+RECOMMENDATIONS_CHUNK_SIZE = 500
+RECOMMENDATIONS_GROUP_WEIGHT = 0.5
+RECOMMENDATIONS_READERS_PER_AUTHOR = 200
+RECOMMENDATIONS_AUTHORS_PER_READER = 200
+RECOMMENDATIONS_AUTHORS_PER_GROUP = 200
+RECOMMENDATIONS_CACHE_TIMEOUT = 60 * 10
+
+TRENDING_EPOCH = datetime(2022, 1, 1, tzinfo=timezone.utc)
+TRENDING_HALF_LIFE = 24
+TRENDING_POST_WEIGHT = 1
+TRENDING_COMMENT_WEIGHT = 2
+TRENDING_FOLLOW_WEIGHT = 3
+TRENDING_WINDOW = 7
+TRENDING_LIST_SIZE = 200
+TRENDING_LIST_TIMEOUT = 60
+TRENDING_GROUPS = 10
+
+GROUPS_PER_PAGE = 20
+GROUPS_CACHE_TIMEOUT = 60 * 5
+
+LOOKUP_CACHE_SIZE = 1024
+LOOKUP_LOCAL_TTL = 30
+LOOKUP_SHARED_TTL = 60 * 10
+LOOKUP_NEGATIVE_TTL = 60
+
+# Поток SSE держит поток и соединение с базой на все время ответа, а
+# Broker будит только подписчиков своего процесса. Поэтому включайте его
+# только для отдельного асинхронного процесса, а страницы опрашивают
+# ленту короткими запросами раз в FEED_EVENTS_POLL_INTERVAL секунд.
+FEED_EVENTS_STREAM = False
+FEED_EVENTS_POLL_INTERVAL = 30
+FEED_EVENTS_DURATION = 30
+FEED_EVENTS_KEEPALIVE = 10
+FEED_EVENTS_RETRY = 3000
+
+ARCHIVE_CHUNK_SIZE = 500
+ARCHIVE_CACHE_TIMEOUT = 60 * 10
+
+EXPORT_CHUNK_SIZE = 500
+EXPORT_BUFFER_SIZE = 64 * 1024
 
 CSRF_FAILURE_VIEW = 'core.views.csrf_failure'
 
@@ -26,6 +96,7 @@ INSTALLED_APPS = [
     'users.apps.UsersConfig',
     'posts.apps.PostsConfig',
     'core.apps.CoreConfig',
+    'api.apps.ApiConfig',
     'django.contrib.admin',
     'django.contrib.auth',
     'django.contrib.contenttypes',
@@ -37,6 +108,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -47,18 +119,30 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'yatube.urls'
 
+CACHED_TEMPLATES = not DEBUG
+
+TEMPLATE_LOADERS = [
+    'django.template.loaders.filesystem.Loader',
+    'django.template.loaders.app_directories.Loader',
+]
+if CACHED_TEMPLATES:
+    TEMPLATE_LOADERS = [
+        ('django.template.loaders.cached.Loader', TEMPLATE_LOADERS),
+    ]
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
         'DIRS': [os.path.join(BASE_DIR, 'templates')],
-        'APP_DIRS': True,
         'OPTIONS': {
+            'loaders': TEMPLATE_LOADERS,
             'context_processors': [
                 'django.template.context_processors.debug',
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'core.context_processors.year.year',
+                'core.context_processors.notifications.notifications',
             ],
         },
     },
@@ -81,13 +165,35 @@ AUTH_PASSWORD_VALIDATORS = [
         'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
     },
     {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+        'NAME': 'users.validators.PreloadedCommonPasswordValidator',
     },
     {
         'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
     },
 ]
 
+AUTHENTICATION_BACKENDS = ['users.backends.OffloadedModelBackend']
+AUTH_USER_CACHE_TIMEOUT = 60
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+PASSWORD_HASHERS = [
+    'users.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', 150000))
+# Ограничение на процесс: при N процессах входы займут до 2 * N ядер.
+PASSWORD_HASH_CONCURRENCY = 2
+
+LOGIN_THROTTLE_PERIOD = 60 * 5
+LOGIN_THROTTLE_IP_LIMIT = 20
+LOGIN_THROTTLE_USERNAME_LIMIT = 5
+# Число доверенных прокси перед приложением: адрес клиента берется из
+# X-Forwarded-For на столько позиций от конца. 0 — только REMOTE_ADDR.
+LOGIN_THROTTLE_TRUSTED_PROXIES = 0
+
 LANGUAGE_CODE = 'ru'
 
 LOGIN_URL = 'users:login'
@@ -104,8 +210,30 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = (os.path.join(BASE_DIR, 'static'),)
-
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
+if not DEBUG:
+    STATICFILES_STORAGE = 'core.storage.CompressedManifestStaticFilesStorage'
+SERVE_STATIC = False
+STATIC_MAX_AGE = 60 * 60 * 24 * 365
+
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_BROTLI_QUALITY = 5
+# Поток событий нельзя буферизовать, остальное уже сжато.
+COMPRESSION_SKIP_TYPES = (
+    'text/event-stream',
+    'application/zip',
+    'application/gzip',
+    'image/',
+    'video/',
+    'audio/',
+)
+
+EMAIL_BACKEND = 'core.mail.QueuedEmailBackend'
+EMAIL_QUEUE_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_QUEUE_BATCH_SIZE = 50
+EMAIL_QUEUE_IDLE_TIMEOUT = 5
+EMAIL_RATE_LIMIT = 5
+EMAIL_RATE_PERIOD = 60 * 60
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
 
 CACHES = {